@@ -0,0 +1,146 @@
+import argparse
+from functools import partial
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from features import clean_survey, missing_category
+from metrics import timed
+from model_export import get_exported_model
+from parallel import default_workers, make_executor, predict_proba_parallel
+from utils import DEFAULT_MODEL_PATH, get_model
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def read_chunks(input_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yields DataFrames of at most chunk_size rows from a CSV, Parquet or JSONL file.
+    Only one chunk is held in memory at a time.
+    """
+    input_path = Path(input_path)
+    suffix = input_path.suffix.lower()
+    if suffix == ".csv":
+        yield from pd.read_csv(input_path, chunksize=chunk_size, dtype=str)
+    elif suffix == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif suffix in (".jsonl", ".json"):
+        yield from pd.read_json(input_path, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        raise ValueError(f"Unsupported input format: {input_path.suffix}")
+
+
+def score_frame(model, df: pd.DataFrame, threshold: float = 0.5, predict=None) -> pd.DataFrame:
+    """
+    Scores every row of df in one predict_proba call.
+    model: a CatBoostClassifier or model_export.NumpyTreeModel
+    Raw survey rows (with Country and Occupation) are cleaned and feature-engineered first.
+    The model's own feature_names_ pick the input columns, so the full-feature model scores as well.
+    A missing self_employed answer becomes the training category 'Missing'; rows missing any other feature
+    are invalid and get a NaN probability and a null prediction instead of being scored.
+    predict: optional function from model input rows to class 1 probabilities (defaults to model.predict_proba)
+    Returns df with 'probability' (class 1) and 'prediction' columns appended.
+    """
+    feature_names = list(model.feature_names_)
+    model_input = df
+    if not set(feature_names) <= set(df.columns) and {'Country', 'Occupation'} <= set(df.columns):
+        # Cleaning replaces Occupation with Occupation_Category; the full-feature model takes both
+        model_input = clean_survey(df).assign(Occupation=df['Occupation'])
+    missing = [col for col in feature_names if col not in model_input.columns]
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {missing}")
+    rows = model_input[feature_names].astype(object)
+    if 'self_employed' in rows.columns:
+        rows['self_employed'] = rows['self_employed'].fillna(missing_category)
+    valid = rows.notna().all(axis=1).to_numpy()
+    rows = rows[valid].astype(str)
+    probabilities = np.full(len(df), np.nan)
+    if len(rows):
+        with timed("predict_proba_seconds", caller="batch_scoring"):
+            probabilities[valid] = predict(rows) if predict is not None else model.predict_proba(rows)[:, 1]
+    scored = df.copy()
+    scored["probability"] = probabilities
+    scored["prediction"] = pd.Series((probabilities >= threshold).astype(int), index=df.index, dtype="Int64").mask(~valid)
+    return scored
+
+
+class _ChunkWriter:
+    def __init__(self, output_path: Path):
+        self.output_path = Path(output_path)
+        self.suffix = self.output_path.suffix.lower()
+        if self.suffix not in (".csv", ".parquet", ".jsonl", ".json"):
+            raise ValueError(f"Unsupported output format: {self.output_path.suffix}")
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, df: pd.DataFrame):
+        if self.suffix == ".csv":
+            df.to_csv(self.output_path, mode="w" if self._first else "a", header=self._first, index=False)
+        elif self.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            with open(self.output_path, "w" if self._first else "a") as f:
+                df.to_json(f, orient="records", lines=True)
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_file(input_path: Path, output_path: Path, model_path: Path = DEFAULT_MODEL_PATH,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, threshold: float = 0.5, workers: int = 1,
+               engine: str = "catboost") -> int:
+    """
+    Scores input_path chunk by chunk and writes the scored rows to output_path.
+    With workers > 1 each chunk is sharded by row range across a process pool.
+    engine='numpy' scores with the model's JSON export (model_export.py) instead of loading catboost.
+    The output format follows the file extension. Returns the number of rows scored.
+    """
+    executor, predict = None, None
+    if engine == "numpy":
+        model = get_exported_model(model_path)
+    elif engine == "catboost":
+        model = get_model(model_path)
+        executor = make_executor(workers) if workers > 1 else None
+        predict = partial(predict_proba_parallel, model_path=model_path, executor=executor) if executor else None
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+    writer = _ChunkWriter(output_path)
+    n_rows = 0
+    try:
+        for chunk in read_chunks(input_path, chunk_size):
+            writer.write(score_frame(model, chunk, threshold, predict))
+            n_rows += len(chunk)
+    finally:
+        writer.close()
+        if executor is not None:
+            executor.shutdown()
+    return n_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-score survey answers with the mental health model.")
+    parser.add_argument("input", type=Path, help="CSV, Parquet or JSONL file with the model's feature columns")
+    parser.add_argument("output", type=Path, help="Destination file (.csv, .parquet or .jsonl)")
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH, help="Path to the .cbm model")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per predict_proba call")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Probability cut-off for the label")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes per chunk (0 uses every core)")
+    parser.add_argument("--engine", choices=["catboost", "numpy"], default="catboost",
+                        help="Score with catboost or with the NumPy evaluator over the model's JSON export")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or default_workers()
+    n_rows = score_file(args.input, args.output, args.model, args.chunk_size, args.threshold, workers, args.engine)
+    print(f"Scored {n_rows} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Import-time report for the Streamlit pages.
+
+Runs each page's top-level imports in a fresh interpreter with -X importtime and
+reports the wall time, peak RSS and heaviest modules against a per-page budget.
+Exits non-zero if any page is over budget.
+
+Usage (from the repository root):
+    python -m benchmarks.import_report [--top 10] [--json report.json]
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Startup budgets (seconds of import time) for each page
+page_budgets = {
+    "Homepage.py": 1.0,
+    "pages/Mental_Health_Prediction_App.py": 1.5,
+    "pages/Dashboard.py": 2.5,
+    "pages/Model_Analysis.py": 2.0,
+}
+
+_probe = """
+import resource, time, json, sys
+_started = time.perf_counter()
+{imports}
+print(json.dumps({{"seconds": time.perf_counter() - _started,
+                  "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+
+def page_imports(page: Path) -> str:
+    """The page's top-level import statements as source."""
+    tree = ast.parse(page.read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, cumulative seconds) for modules imported directly by the page, heaviest first."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            modules.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(modules, key=lambda item: item[1], reverse=True)
+
+
+def measure_page(page: str) -> dict:
+    source = _probe.format(imports=page_imports(ROOT / page))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", source], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return {**report, "budget": page_budgets[page], "modules": parse_importtime(result.stderr)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import time and memory for each Streamlit page.")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest modules to list per page")
+    parser.add_argument("--json", type=Path, help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = {page: measure_page(page) for page in page_budgets}
+    over_budget = []
+    for page, result in report.items():
+        status = "ok" if result["seconds"] <= result["budget"] else "OVER BUDGET"
+        if status != "ok":
+            over_budget.append(page)
+        print(f"{page:<40} {result['seconds']:>6.2f}s / {result['budget']:.1f}s  "
+              f"{result['max_rss_mb']:>6.0f} MB  {status}")
+        for module, seconds in result["modules"][:args.top]:
+            print(f"    {module:<36} {seconds:>6.3f}s")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if over_budget:
+        sys.exit(f"Over import-time budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
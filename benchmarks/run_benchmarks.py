@@ -0,0 +1,162 @@
+"""
+Benchmarks for the load, preprocess, predict and dashboard aggregation hot paths.
+
+Runs offline on synthetic data and writes one JSON file per run, so results can
+be compared across commits.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks [--sizes 10000 300000 3000000] [--output results.json]
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import utils
+from association_stats import association_summary
+from benchmarks.synthetic import cleaned_survey, raw_survey
+from eda_aggregates import chunk_aggregates, eda_features, finalize_aggregates
+from lookup_table import get_table, lookup_probability
+from utils import DEFAULT_MODEL_PATH, feature_order
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_SIZES = [10_000, 300_000]
+
+sample_answers = {
+    'Gender': 'Male',
+    'self_employed': 'No',
+    'family_history': 'Yes',
+    'Mental_Health_History': 'No',
+    'mental_health_interview': 'No',
+    'care_options': 'Yes',
+    'Continent': 'Asia',
+    'Occupation_Category': 'Professional'
+}
+
+
+def measure(fn, repeat: int = 5, number: int = 1) -> dict:
+    """Per-call wall time of fn over repeat rounds of number calls."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - started) / number)
+    return {"median": statistics.median(times), "min": min(times), "repeat": repeat, "number": number}
+
+
+def with_rows(result: dict, n_rows: int) -> dict:
+    return {**result, "rows": n_rows, "rows_per_second": n_rows / result["median"]}
+
+
+def single_row_benchmarks() -> dict:
+    model = utils.get_model(DEFAULT_MODEL_PATH)
+    encoder = utils.get_encoder(DEFAULT_MODEL_PATH)
+    encoded = encoder.encode(sample_answers)
+    get_table(DEFAULT_MODEL_PATH)
+    return {
+        "model_load_cold": measure(lambda: utils.load_model(DEFAULT_MODEL_PATH), repeat=5),
+        "model_load_warm": measure(lambda: utils.get_model(DEFAULT_MODEL_PATH), number=1000),
+        "preprocess_input": measure(lambda: utils.preprocess_input(sample_answers, feature_order), number=1000),
+        "encoder_single_row": measure(lambda: encoder.encode(sample_answers), number=1000),
+        "predict_proba_single_row": measure(lambda: model.predict_proba(encoded), number=200),
+        "lookup_probability_single_row": measure(lambda: lookup_probability(sample_answers), number=1000),
+    }
+
+
+def sized_benchmarks(n_rows: int, work_dir: Path) -> dict:
+    model = utils.get_model(DEFAULT_MODEL_PATH)
+    raw = raw_survey(n_rows)
+    cleaned = cleaned_survey(n_rows)
+    csv_path = work_dir / f"cleaned_{n_rows}.csv"
+    cleaned.to_csv(csv_path, index=False)
+    rows = cleaned[feature_order]
+    repeat = 5 if n_rows <= 300_000 else 2
+
+    def dataset_cold():
+        for stale in (work_dir / ".cache").glob(f"{csv_path.stem}-*.parquet"):
+            stale.unlink()
+        utils.load_columnar(csv_path)
+
+    def dashboard_groupby():
+        for feature in eda_features:
+            cleaned[feature].value_counts().sort_index()
+            grouped = cleaned.groupby([feature, 'treatment']).size().unstack(fill_value=0)
+            grouped.div(grouped.sum(axis=1), axis=0)
+
+    aggregates = finalize_aggregates(chunk_aggregates(raw))
+    results = {
+        "load_data_csv": measure(lambda: utils.load_data(csv_path), repeat),
+        "dataset_columnar_cold": measure(dataset_cold, repeat),
+        "dataset_columnar_warm": measure(lambda: utils.load_columnar(csv_path), repeat),
+        "predict_proba_batch": measure(lambda: model.predict_proba(rows), repeat),
+        "dashboard_groupby": measure(dashboard_groupby, repeat),
+        "dashboard_aggregates_build": measure(lambda: chunk_aggregates(raw), repeat),
+        "dashboard_aggregates_lookup": measure(
+            lambda: [aggregates["treatment_percent"][feature] for feature in eda_features], number=1000),
+        "association_summary": measure(lambda: association_summary(cleaned), repeat),
+    }
+    return {name: with_rows(result, n_rows) for name, result in results.items()}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(sizes: list) -> dict:
+    results = single_row_benchmarks()
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in sizes:
+            for name, result in sized_benchmarks(n_rows, Path(tmp)).items():
+                results[f"{name}[{n_rows}]"] = result
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(base_path: Path, new_path: Path):
+    base = json.loads(Path(base_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    print(f"{'benchmark':<48} {base['commit']:>12} {new['commit']:>12} {'ratio':>8}")
+    for name, result in new["results"].items():
+        if name in base["results"]:
+            old_time, new_time = base["results"][name]["median"], result["median"]
+            print(f"{name:<48} {old_time * 1e3:>10.3f}ms {new_time * 1e3:>10.3f}ms {new_time / old_time:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the app's hot paths on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Synthetic dataset sizes")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("BASE", "NEW"), help="Compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args.sizes)
+    output = args.output or RESULTS_DIR / f"{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    for name, result in report["results"].items():
+        print(f"{name:<48} {result['median'] * 1e3:>10.3f}ms")
+    print(f"Results -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Synthetic survey data matching the Kaggle export and cleaned_dataset.csv schemas.
+
+Answers are drawn independently from the categories seen in the real survey, so
+the data has realistic cardinalities but no real associations.
+"""
+import numpy as np
+import pandas as pd
+from features import clean_survey
+
+answer_values = {
+    'Gender': ['Female', 'Male'],
+    'Country': ['United States', 'Poland', 'Australia', 'Canada', 'United Kingdom', 'South Africa', 'Sweden',
+                'New Zealand', 'Netherlands', 'India', 'Belgium', 'Ireland', 'France', 'Portugal', 'Brazil',
+                'Costa Rica', 'Russia', 'Germany', 'Switzerland', 'Finland', 'Israel', 'Italy',
+                'Bosnia and Herzegovina', 'Singapore', 'Nigeria', 'Croatia', 'Thailand', 'Denmark', 'Mexico',
+                'Greece', 'Moldova', 'Colombia', 'Georgia', 'Czech Republic', 'Philippines'],
+    'Occupation': ['Corporate', 'Student', 'Business', 'Housewife', 'Others'],
+    'self_employed': ['Yes', 'No', None],
+    'family_history': ['Yes', 'No'],
+    'treatment': ['Yes', 'No'],
+    'Days_Indoors': ['Go out Every day', '1-14 days', '15-30 days', '31-60 days', 'More than 2 months'],
+    'Growing_Stress': ['Yes', 'No', 'Maybe'],
+    'Changes_Habits': ['Yes', 'No', 'Maybe'],
+    'Mental_Health_History': ['Yes', 'No', 'Maybe'],
+    'Mood_Swings': ['Low', 'Medium', 'High'],
+    'Coping_Struggles': ['Yes', 'No'],
+    'Work_Interest': ['Yes', 'No', 'Maybe'],
+    'Social_Weakness': ['Yes', 'No', 'Maybe'],
+    'mental_health_interview': ['Yes', 'No', 'Maybe'],
+    'care_options': ['Yes', 'No', 'Not sure'],
+}
+
+
+def raw_survey(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Rows shaped like Data/Mental Health Dataset.csv."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        col: rng.choice(np.array(values, dtype=object), n_rows)
+        for col, values in answer_values.items()
+    })
+    df.insert(0, 'Timestamp', '8/27/2014 11:29')
+    return df
+
+
+def cleaned_survey(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Rows shaped like Data/cleaned_dataset.csv."""
+    return clean_survey(raw_survey(n_rows, seed)).astype(object)
@@ -0,0 +1,161 @@
+"""
+Latency-aware compaction of a trained model, with a recall guardrail.
+
+Builds smaller variants of a .cbm and scores each on the held-out split that
+train.py uses:
+
+    best_iteration   the model cut back to its best validation iteration
+    shrink_<n>       the first n trees only (CatBoostClassifier.shrink)
+    depth_<d>        retrained with train.py's recipe at a shallower depth
+    drop_dead        retrained with zero-importance features ignored
+
+Retrains early-stop on a validation split carved out of the training rows, as
+in tune.py, so the held-out split is only used for scoring. Each variant's
+held-out F1/recall, file size, load time and per-row latency are compared with
+the original. The fastest variant whose treatment-class recall stays within
+--max-recall-drop of the original is written out; if none qualifies, nothing
+is written and the command exits non-zero.
+
+Usage:
+    python compact.py --data "Data/Mental Health Dataset.csv" [--model PATH] [--max-recall-drop 0.01]
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from sklearn.metrics import f1_score, recall_score
+from sklearn.model_selection import train_test_split
+from train import RAW_DATA_PATH, load_training_data, split_features, train_model
+from tune import single_row_latency, validation_size
+from utils import DEFAULT_MODEL_PATH, load_model
+
+shrink_fractions = (0.75, 0.5, 0.25)
+retrain_depths = (3, 4, 5)
+# A variant must beat the original's single-row latency by this factor to be worth shipping
+MIN_SPEEDUP = 1.05
+
+
+def compacted_path(model_path: Path) -> Path:
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}.compact.cbm")
+
+
+def shrunk(model, ntree_end: int):
+    model = model.copy()
+    model.shrink(ntree_end)
+    return model
+
+
+def candidates(model, X_train, y_train, seed: int = 42) -> dict:
+    """
+    Name -> function building that compacted variant (retraining is deferred until it is profiled).
+    Retrains early-stop on a validation split of the training rows, so the held-out split stays unseen.
+    """
+    X_fit, X_valid, y_fit, y_valid = train_test_split(X_train, y_train, stratify=y_train,
+                                                      test_size=validation_size, random_state=seed)
+    tree_count = model.tree_count_
+    variants = {}
+    best_iteration = model.get_best_iteration()
+    if best_iteration is not None and best_iteration + 1 < tree_count:
+        variants["best_iteration"] = lambda: shrunk(model, best_iteration + 1)
+    for fraction in shrink_fractions:
+        n_trees = max(1, int(tree_count * fraction))
+        if n_trees >= tree_count:
+            continue
+        variants[f"shrink_{n_trees}"] = lambda n_trees=n_trees: shrunk(model, n_trees)
+    for depth in retrain_depths:
+        variants[f"depth_{depth}"] = lambda depth=depth: train_model(
+            X_fit, y_fit, X_valid, y_valid, verbose=0, params={"depth": depth})
+    dead = [name for name, importance in zip(model.feature_names_, model.get_feature_importance()) if importance < 0.01]
+    if dead:
+        variants["drop_dead"] = lambda: train_model(
+            X_fit, y_fit, X_valid, y_valid, verbose=0, params={"ignored_features": dead})
+    return variants
+
+
+def profile(model, X_test, y_test, work_dir: Path, name: str) -> dict:
+    """Held-out quality plus size, load time and latency of model saved as a .cbm."""
+    path = work_dir / f"{name}.cbm"
+    model.save_model(str(path))
+    load_times = []
+    for _ in range(5):
+        started = time.perf_counter()
+        load_model(path)
+        load_times.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    y_pred = (model.predict_proba(X_test)[:, 1] >= 0.5).astype(int)
+    batch_seconds = time.perf_counter() - started
+    return {
+        "tree_count": model.tree_count_,
+        "depth": model.get_all_params().get("depth"),
+        "f1": f1_score(y_test, y_pred, zero_division=0),
+        "recall": recall_score(y_test, y_pred, zero_division=0),
+        "size_bytes": path.stat().st_size,
+        "load_ms": statistics.median(load_times) * 1e3,
+        "latency_ms_single_row": single_row_latency(model, X_test.iloc[:1]) * 1e3,
+        "latency_us_per_row_batch": batch_seconds / len(X_test) * 1e6,
+    }
+
+
+def compact(model_path: Path, data_path: Path, max_recall_drop: float = 0.01) -> dict:
+    """Profiles the original and every variant; returns the report with the selected variant (or None)."""
+    model = load_model(model_path)
+    X_train, X_test, y_train, y_test = split_features(load_training_data(data_path))
+    report = {"max_recall_drop": max_recall_drop, "variants": {}, "selected": None}
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        report["original"] = original = profile(model, X_test, y_test, work_dir, "original")
+        models = {}
+        for name, build in candidates(model, X_train, y_train).items():
+            models[name] = build()
+            result = profile(models[name], X_test, y_test, work_dir, name)
+            result["recall_drop"] = original["recall"] - result["recall"]
+            result["passes"] = result["recall_drop"] <= max_recall_drop
+            report["variants"][name] = result
+
+    passing = [name for name, result in report["variants"].items() if result["passes"]]
+    if passing:
+        selected = min(passing, key=lambda name: (report["variants"][name]["latency_ms_single_row"],
+                                                   report["variants"][name]["size_bytes"]))
+        if report["variants"][selected]["latency_ms_single_row"] * MIN_SPEEDUP <= original["latency_ms_single_row"]:
+            report["selected"] = selected
+            report["model"] = models[selected]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shrink a trained model without losing treatment recall.")
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH, help="Path to the .cbm model")
+    parser.add_argument("--data", type=Path, default=RAW_DATA_PATH,
+                        help="Raw survey export or cleaned dataset; the held-out split is recreated as in train.py")
+    parser.add_argument("--max-recall-drop", type=float, default=0.01,
+                        help="Largest allowed drop in treatment-class recall versus the original")
+    parser.add_argument("--output", type=Path, help="Where to write the compacted model (default: <model>.compact.cbm)")
+    args = parser.parse_args(argv)
+
+    report = compact(args.model, args.data, args.max_recall_drop)
+    original = report["original"]
+    print(f"{'variant':<16} {'trees':>6} {'f1':>7} {'recall':>7} {'size KB':>8} {'load ms':>8} {'row ms':>8}")
+    for name, result in {"original": original, **report["variants"]}.items():
+        flag = "" if name == "original" or result["passes"] else "  recall drop too large"
+        print(f"{name:<16} {result['tree_count']:>6} {result['f1']:>7.4f} {result['recall']:>7.4f} "
+              f"{result['size_bytes'] / 1024:>8.1f} {result['load_ms']:>8.2f} {result['latency_ms_single_row']:>8.3f}{flag}")
+
+    if report["selected"] is None:
+        sys.exit(f"Refusing to ship: no variant is {MIN_SPEEDUP}x faster than the original "
+                 f"with recall within {args.max_recall_drop}")
+    output = args.output or compacted_path(args.model)
+    report.pop("model").save_model(str(output))
+    output.with_suffix(".json").write_text(json.dumps(report, indent=2))
+    selected = report["variants"][report["selected"]]
+    print(f"Selected {report['selected']}: {original['size_bytes'] / selected['size_bytes']:.1f}x smaller, "
+          f"{original['load_ms'] / selected['load_ms']:.1f}x faster load, "
+          f"{original['latency_ms_single_row'] / selected['latency_ms_single_row']:.1f}x faster per row -> {output}")
+
+
+if __name__ == "__main__":
+    main()
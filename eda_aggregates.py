@@ -0,0 +1,232 @@
+"""
+Incremental aggregates behind the EDA Dashboard.
+
+Every count, crosstab and missing-value summary the dashboard renders is kept as
+mergeable count state in Data/.cache. The state remembers how far into the raw
+survey export it has read, so when rows are appended to the export only the new
+rows are cleaned and counted and then merged in. Percentages and chi-square
+statistics are derived from the merged counts at read time.
+
+Usage:
+    python eda_aggregates.py [--original PATH] [--rebuild]
+"""
+import argparse
+import hashlib
+import io
+import json
+from pathlib import Path
+import pandas as pd
+from features import clean_survey
+from ingest import DEFAULT_CHUNK_SIZE, RAW_DATA_ENCODING, raw_dtypes
+from utils import shared_resource, temporary_path
+
+ORIGINAL_DATA_PATH = Path("Data/Mental Health Dataset.csv")
+# Bytes just before the saved offset that must be unchanged for appended rows to be merged
+FINGERPRINT_BYTES = 1 << 16
+
+eda_features = [
+    "Gender","self_employed", "family_history",
+    "Days_Indoors", "Growing_Stress", "Changes_Habits", "Mental_Health_History",
+    "Mood_Swings", "Coping_Struggles", "Work_Interest", "Social_Weakness",
+    "mental_health_interview", "care_options", "Continent","Occupation_Category"
+]
+
+_aggregates = {}
+
+
+def _counts(series: pd.Series) -> pd.Series:
+    counts = series.value_counts()
+    counts = counts[counts > 0].rename("count")
+    counts.index = counts.index.astype(object)
+    return counts
+
+
+def _treatment_crosstab(df: pd.DataFrame, feature: str) -> pd.DataFrame:
+    crosstab = pd.crosstab(df[feature], df["treatment"])
+    crosstab.index = crosstab.index.astype(object).rename(feature)
+    crosstab.columns = crosstab.columns.astype(object).rename(None)
+    return crosstab
+
+
+def chunk_aggregates(raw: pd.DataFrame) -> dict:
+    """Count state for a block of raw survey rows."""
+    cleaned = clean_survey(raw)
+    return {
+        "n_original_rows": len(raw),
+        "n_cleaned_rows": len(cleaned),
+        "missing_values": raw.isnull().sum().rename("missing"),
+        "country_counts": _counts(raw["Country"]),
+        "occupation_counts": _counts(raw["Occupation"]),
+        "value_counts": {feature: _counts(cleaned[feature]) for feature in eda_features},
+        "treatment_counts": {feature: _treatment_crosstab(cleaned, feature) for feature in eda_features},
+    }
+
+
+def merge_aggregates(left: dict, right: dict) -> dict:
+    """Adds two count states; categories missing on either side count as zero."""
+    merged = {}
+    for key in left.keys() | right.keys():
+        if key not in left or key not in right:
+            merged[key] = left.get(key, right.get(key))
+            continue
+        a, b = left[key], right[key]
+        if isinstance(a, dict):
+            merged[key] = merge_aggregates(a, b)
+        elif isinstance(a, (pd.Series, pd.DataFrame)):
+            merged[key] = a.add(b, fill_value=0).astype(int)
+        else:
+            merged[key] = a + b
+    return merged
+
+
+def finalize_aggregates(counts: dict) -> dict:
+    """Orders the merged counts for display and derives the treatment percentages."""
+    treatment_counts = {feature: table.sort_index() for feature, table in counts["treatment_counts"].items()}
+    return {
+        **counts,
+        "country_counts": counts["country_counts"].sort_values(ascending=False),
+        "occupation_counts": counts["occupation_counts"].sort_index(),
+        "value_counts": {feature: series.sort_index() for feature, series in counts["value_counts"].items()},
+        "treatment_counts": treatment_counts,
+        "treatment_percent": {
+            feature: table.div(table.sum(axis=1), axis=0) * 100
+            for feature, table in treatment_counts.items()
+        },
+    }
+
+
+def _to_json(value):
+    if isinstance(value, pd.Series):
+        return {"series": value.to_frame().to_dict(orient="split")}
+    if isinstance(value, pd.DataFrame):
+        return {"frame": value.to_dict(orient="split"), "index_name": value.index.name}
+    if isinstance(value, dict):
+        return {"dict": {key: _to_json(v) for key, v in value.items()}}
+    return {"value": value}
+
+
+def _from_json(data):
+    if "series" in data:
+        return pd.DataFrame(**data["series"]).iloc[:, 0]
+    if "frame" in data:
+        return pd.DataFrame(**data["frame"]).rename_axis(index=data["index_name"])
+    if "dict" in data:
+        return {key: _from_json(v) for key, v in data["dict"].items()}
+    return data["value"]
+
+
+def state_path(original_path: Path) -> Path:
+    original_path = Path(original_path)
+    return original_path.parent / ".cache" / f"eda_state-{original_path.stem}.json"
+
+
+def load_state(path: Path):
+    path = Path(path)
+    return _from_json(json.loads(path.read_text())) if path.exists() else None
+
+
+def save_state(state: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temporary_path(path)
+    tmp_path.write_text(json.dumps(_to_json(state), default=int))
+    tmp_path.replace(path)
+
+
+class _BoundedReader(io.RawIOBase):
+    """Reads f from its current position up to byte offset end."""
+
+    def __init__(self, f, end: int):
+        self._f = f
+        self._end = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._f.read(max(0, min(len(buffer), self._end - self._f.tell())))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _complete_lines_end(f, start: int, size: int, block_size: int = 1 << 16) -> int:
+    """Offset just past the last newline after start, so a half-written final row is left for next time."""
+    end = size
+    while end > start:
+        block_start = max(start, end - block_size)
+        f.seek(block_start)
+        newline = f.read(end - block_start).rfind(b"\n")
+        if newline >= 0:
+            return block_start + newline + 1
+        end = block_start
+    return start
+
+
+def _fingerprint(f, offset: int) -> str:
+    """Hash of the bytes just before offset, to tell an appended-to export from a rewritten one."""
+    f.seek(max(0, offset - FINGERPRINT_BYTES))
+    return hashlib.blake2b(f.read(min(offset, FINGERPRINT_BYTES)), digest_size=16).hexdigest()
+
+
+def update_state(state, original_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 encoding: str = RAW_DATA_ENCODING) -> dict:
+    """
+    Folds the complete rows appended to original_path since state was saved into state.
+    Starts from scratch when state is None or the export was rewritten rather than appended to.
+    """
+    with open(original_path, "rb") as f:
+        header = f.readline()
+        size = f.seek(0, 2)
+        source = state["source"] if state is not None else None
+        if source is not None and (source["header"] != header.decode(encoding) or source["offset"] > size
+                                   or source.get("fingerprint") != _fingerprint(f, source["offset"])):
+            state = None
+        if state is None:
+            state = {"source": {"header": header.decode(encoding), "offset": len(header)}, "counts": None}
+
+        offset = state["source"]["offset"]
+        end = _complete_lines_end(f, offset, size)
+        names = pd.read_csv(io.StringIO(state["source"]["header"]), nrows=0).columns
+        counts = state["counts"]
+        if counts is None:
+            counts = chunk_aggregates(pd.DataFrame(columns=names).astype(raw_dtypes))
+        if end > offset:
+            f.seek(offset)
+            reader = io.BufferedReader(_BoundedReader(f, end))
+            for chunk in pd.read_csv(reader, header=None, names=names, chunksize=chunk_size, encoding=encoding,
+                                     dtype=raw_dtypes):
+                counts = merge_aggregates(counts, chunk_aggregates(chunk))
+        state["source"]["offset"] = end
+        state["source"]["fingerprint"] = _fingerprint(f, end)
+    state["counts"] = counts
+    return state
+
+
+def refresh_aggregates(original_path: Path = ORIGINAL_DATA_PATH, rebuild: bool = False) -> dict:
+    """Brings the persisted state up to date with original_path and returns it."""
+    path = state_path(original_path)
+    state = update_state(None if rebuild else load_state(path), original_path)
+    save_state(state, path)
+    return state
+
+
+def get_aggregates(original_path: Path = ORIGINAL_DATA_PATH) -> dict:
+    """
+    Returns the dashboard aggregates for the raw survey export.
+    Rows appended since the last call are counted and merged into the persisted state.
+    """
+    return shared_resource(_aggregates, original_path,
+                           lambda path: finalize_aggregates(refresh_aggregates(path)["counts"]), "eda_aggregates")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the EDA dashboard aggregates.")
+    parser.add_argument("--original", type=Path, default=ORIGINAL_DATA_PATH, help="Raw survey export CSV")
+    parser.add_argument("--rebuild", action="store_true", help="Recount the whole export instead of appended rows")
+    args = parser.parse_args(argv)
+
+    state = refresh_aggregates(args.original, args.rebuild)
+    print(f"{state['counts']['n_original_rows']} rows aggregated -> {state_path(args.original)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Precomputed SHAP contributions for every possible quiz submission.
+
+Like lookup_table.py, the whole 1,344-combination quiz space is explained in
+one batched get_feature_importance(type='ShapValues') call and stored as a
+float32 matrix indexed by the answer code, so the prediction page can show
+which answers moved a score without calling CatBoost.
+
+Usage:
+    python explanations.py build  [--model PATH]
+    python explanations.py verify [--model PATH] [--samples 50]
+"""
+import argparse
+import numpy as np
+from pathlib import Path
+from lookup_table import encode_answers, get_table, n_combinations, quiz_space
+from utils import (DEFAULT_MODEL_PATH, feature_order, file_signature, get_model, model_input_rows, savez_atomic,
+                   shared_resource)
+
+_shap_registry = {}
+
+
+def shap_table_path(model_path: Path) -> Path:
+    model_path = Path(model_path)
+    return model_path.parent / ".cache" / f"{model_path.stem}.shap.npz"
+
+
+def shap_values(model_path: Path, answer_rows: list) -> np.ndarray:
+    """Live (n_rows, n_model_features + 1) SHAP matrix in log-odds; the last column is the expected value."""
+    from catboost import Pool
+    model = get_model(model_path)
+    pool = Pool(model_input_rows(answer_rows, model.feature_names_), cat_features=model.get_cat_feature_indices(),
+                feature_names=model.feature_names_)
+    return model.get_feature_importance(pool, type="ShapValues")
+
+
+def build_shap_table(model_path: Path = DEFAULT_MODEL_PATH) -> dict:
+    """Explains the full quiz space in one call and saves the contributions."""
+    table = {
+        "values": shap_values(model_path, quiz_space()).astype(np.float32),
+        "feature_names": np.array(get_model(model_path).feature_names_),
+    }
+    table_path = shap_table_path(model_path)
+    table_path.parent.mkdir(parents=True, exist_ok=True)
+    savez_atomic(table_path, **table, model_signature=np.array(file_signature(model_path)))
+    return table
+
+
+def load_shap_table(model_path: Path) -> dict:
+    """Loads the saved contributions, rebuilding them if they were built from a different model file."""
+    table_path = shap_table_path(model_path)
+    if table_path.exists():
+        with np.load(table_path) as saved:
+            if tuple(saved["model_signature"]) == file_signature(model_path):
+                return {"values": saved["values"], "feature_names": saved["feature_names"]}
+    return build_shap_table(model_path)
+
+
+def get_shap_table(model_path: Path = DEFAULT_MODEL_PATH) -> dict:
+    return shared_resource(_shap_registry, model_path, load_shap_table, "shap_table")
+
+
+def explain(answers: dict, model_path: Path = DEFAULT_MODEL_PATH) -> dict:
+    """
+    How each quiz answer moved the prediction away from the model's average, in log-odds.
+    Returns {'base_value': ..., 'contributions': [{'feature', 'answer', 'contribution'}, ...]}
+    ordered by absolute contribution. Features the quiz does not ask are left out.
+    """
+    table = get_shap_table(model_path)
+    row = table["values"][encode_answers(answers)]
+    feature_index = {name: i for i, name in enumerate(table["feature_names"])}
+    contributions = [
+        {"feature": feature, "answer": answers[feature], "contribution": float(row[feature_index[feature]])}
+        for feature in feature_order if feature in feature_index
+    ]
+    contributions.sort(key=lambda item: abs(item["contribution"]), reverse=True)
+    return {"base_value": float(row[-1]), "contributions": contributions}
+
+
+def verify_shap_table(model_path: Path = DEFAULT_MODEL_PATH, n_samples: int = 50, seed: int = 0,
+                      atol: float = 1e-4) -> float:
+    """
+    Recomputes SHAP values live for n_samples random answer codes and compares them with the table,
+    and checks that every row's contributions add up to the lookup table's prediction.
+    Returns the largest absolute difference; raises AssertionError above atol.
+    """
+    table = get_shap_table(model_path)["values"]
+    codes = np.random.default_rng(seed).choice(n_combinations, size=min(n_samples, n_combinations), replace=False)
+    space = quiz_space()
+    live = shap_values(model_path, [space[code] for code in codes])
+    max_diff = float(np.max(np.abs(table[codes] - live)))
+    if max_diff > atol:
+        raise AssertionError(f"SHAP table differs from live values by {max_diff}")
+
+    log_odds = np.log(get_table(model_path)) - np.log1p(-get_table(model_path))
+    additivity = float(np.max(np.abs(table.sum(axis=1, dtype=np.float64) - log_odds)))
+    if additivity > atol:
+        raise AssertionError(f"SHAP contributions do not add up to the prediction (off by {additivity})")
+    return max(max_diff, additivity)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or verify the precomputed SHAP contributions.")
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH, help="Path to the .cbm model")
+    parser.add_argument("--samples", type=int, default=50, help="Random answer sets to recompute live (verify)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        table = build_shap_table(args.model)
+        print(f"Stored {table['values'].shape} SHAP contributions -> {shap_table_path(args.model)}")
+    else:
+        max_diff = verify_shap_table(args.model, args.samples)
+        print(f"SHAP table matches live values and the lookup table (max abs diff {max_diff:.3g})")
+
+
+if __name__ == "__main__":
+    main()
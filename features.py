@@ -0,0 +1,63 @@
+"""
+Survey cleaning and feature engineering shared by training, batch scoring and ingestion.
+
+Derived features are mapped once per distinct category rather than once per row.
+Data/country_continents.json bundles the country -> continent mapping that the
+notebook looked up row by row through pycountry_convert.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+COUNTRY_CONTINENTS_PATH = Path(__file__).parent / "Data" / "country_continents.json"
+
+professional_roles = ['Business', 'Corporate']
+# Category the models were trained with for an unanswered self_employed question
+missing_category = 'Missing'
+
+
+@lru_cache(maxsize=None)
+def country_continents() -> dict:
+    return json.loads(COUNTRY_CONTINENTS_PATH.read_text(encoding="utf-8"))
+
+
+def map_categories(series: pd.Series, mapping, default) -> pd.Series:
+    """
+    Maps every distinct value of series through mapping (a dict or a function)
+    and broadcasts the results with the categorical codes.
+    Values missing from a dict mapping, and missing values, become default.
+    """
+    categorical = series.astype("category")
+    lookup = (lambda value: mapping.get(value, default)) if isinstance(mapping, dict) else mapping
+    # Code -1 (missing value) picks the trailing default
+    mapped = np.array([*(lookup(category) for category in categorical.cat.categories), default], dtype=object)
+    categories, remapped_codes = np.unique(mapped, return_inverse=True)
+    codes = remapped_codes[categorical.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index, name=series.name)
+
+
+def continent_of(country: pd.Series) -> pd.Series:
+    return map_categories(country, country_continents(), 'Unknown')
+
+
+def occupation_category(occupation: pd.Series) -> pd.Series:
+    return map_categories(
+        occupation, lambda role: 'Professional' if role in professional_roles else 'Non-Professional', 'Non-Professional'
+    )
+
+
+def add_engineered_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Replaces Country and Occupation with Continent and Occupation_Category."""
+    df = df.copy()
+    df['Continent'] = continent_of(df['Country'])
+    df['Occupation_Category'] = occupation_category(df['Occupation'])
+    return df.drop(columns=['Country', 'Occupation'])
+
+
+def clean_survey(df: pd.DataFrame) -> pd.DataFrame:
+    """Applies the notebook's cleaning and feature engineering to the raw survey export."""
+    df = df.drop(columns=['Timestamp'], errors='ignore')
+    df['self_employed'] = df['self_employed'].astype(object).fillna(missing_category)
+    return add_engineered_features(df)
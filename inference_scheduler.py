@@ -0,0 +1,141 @@
+"""
+Micro-batching scheduler for concurrent live-model predictions.
+
+Callers submit single answer dicts from any thread. Each is validated and
+encoded with utils.get_encoder before it is queued, so a bad answer fails the
+caller rather than the batch. A worker thread collects rows until
+max_batch_size is reached or the oldest row has waited max_wait_ms, scores them
+in one predict_proba call and resolves each caller's future.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from metrics import increment, observe, timed
+from utils import DEFAULT_MODEL_PATH, get_encoder, get_model, model_answers
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 3.0
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+class BatchScheduler:
+    def __init__(self, model_path: Path = DEFAULT_MODEL_PATH,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.model_path = Path(model_path)
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batch_size_counts = {}
+        self._rows = 0
+        self._queue_delay_total = 0.0
+        self._queue_delay_max = 0.0
+        self._worker = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, answers: dict) -> Future:
+        """
+        Queues one quiz answer dict; the future resolves to its class 1 probability.
+        Raises ValueError for a missing or unknown answer.
+        """
+        return self.submit_many([answers])[0]
+
+    def submit_many(self, answers_list: list) -> list:
+        """
+        Queues several quiz answer dicts at once, so they can share micro-batches; returns one future per dict.
+        Every dict is validated before any is queued: a missing or unknown answer raises ValueError.
+        Wrap the futures with asyncio.wrap_future to await them without blocking an event loop.
+        """
+        rows = get_encoder(self.model_path).encode([model_answers(answers) for answers in answers_list])
+        queued_at = time.perf_counter()
+        futures = []
+        for row in rows:
+            futures.append(Future())
+            self._queue.put((row, futures[-1], queued_at))
+        return futures
+
+    def predict_proba(self, answers: dict, timeout: float = None) -> float:
+        return self.submit(answers).result(timeout)
+
+    def stats(self) -> dict:
+        """Batch size histogram and queueing delay (seconds) since the scheduler started."""
+        with self._stats_lock:
+            n_batches = sum(self._batch_size_counts.values())
+            return {
+                "batches": n_batches,
+                "rows": self._rows,
+                "mean_batch_size": self._rows / n_batches if n_batches else 0.0,
+                "batch_size_counts": dict(sorted(self._batch_size_counts.items())),
+                "mean_queue_delay": self._queue_delay_total / self._rows if self._rows else 0.0,
+                "max_queue_delay": self._queue_delay_max,
+            }
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                with timed("predict_proba_seconds", caller="scheduler"):
+                    probabilities = get_model(self.model_path).predict_proba([row for row, _, _ in batch])[:, 1]
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), p in zip(batch, probabilities):
+                    future.set_result(float(p))
+            self._record(batch, started)
+
+    def _record(self, batch: list, started: float):
+        """Updates stats() and exports the same figures to metrics.py (mean batch size = rows / batches)."""
+        delays = [started - queued_at for _, _, queued_at in batch]
+        model = self.model_path.stem
+        increment("scheduler_batches_total", model=model)
+        increment("scheduler_rows_total", len(batch), model=model)
+        for delay in delays:
+            observe("scheduler_queue_delay_seconds", delay, model=model)
+        with self._stats_lock:
+            self._batch_size_counts[len(batch)] = self._batch_size_counts.get(len(batch), 0) + 1
+            self._rows += len(batch)
+            self._queue_delay_total += sum(delays)
+            self._queue_delay_max = max(self._queue_delay_max, max(delays))
+
+
+def get_scheduler(model_path: Path = DEFAULT_MODEL_PATH, max_batch_size: int = None,
+                  max_wait_ms: float = None) -> BatchScheduler:
+    """
+    Returns the process-wide scheduler for model_path, creating it on first use.
+    Settings left as None take the defaults (or the existing scheduler's); asking for settings that
+    differ from those of the existing scheduler raises ValueError rather than being silently ignored.
+    """
+    key = str(Path(model_path).resolve())
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = _schedulers[key] = BatchScheduler(
+                model_path,
+                DEFAULT_MAX_BATCH_SIZE if max_batch_size is None else max_batch_size,
+                DEFAULT_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms,
+            )
+        elif ((max_batch_size is not None and max_batch_size != scheduler.max_batch_size)
+              or (max_wait_ms is not None and max_wait_ms != scheduler.max_wait_ms)):
+            raise ValueError(f"The scheduler for {model_path} already runs with max_batch_size="
+                             f"{scheduler.max_batch_size}, max_wait_ms={scheduler.max_wait_ms}")
+        return scheduler
@@ -0,0 +1,99 @@
+"""
+Streaming ingestion for raw survey exports.
+
+The export is read in fixed-size chunks with categorical dtypes and the Kaggle
+file's encoding. Each chunk is cleaned and feature-engineered on its own, then
+handed to a sink, so peak memory depends on the chunk size rather than the file size.
+
+Usage:
+    python ingest.py "Data/Mental Health Dataset.csv" --parquet Data/cleaned_dataset.parquet [--csv Data/cleaned_dataset.csv]
+"""
+import argparse
+from pathlib import Path
+import pandas as pd
+from features import clean_survey
+
+RAW_DATA_ENCODING = "ISO-8859-1"
+DEFAULT_CHUNK_SIZE = 250_000
+
+raw_columns = ['Timestamp', 'Gender', 'Country', 'Occupation', 'self_employed', 'family_history', 'treatment',
+               'Days_Indoors', 'Growing_Stress', 'Changes_Habits', 'Mental_Health_History', 'Mood_Swings',
+               'Coping_Struggles', 'Work_Interest', 'Social_Weakness', 'mental_health_interview', 'care_options']
+
+# Every survey answer is categorical; Timestamp is dropped during cleaning and never parsed
+raw_dtypes = {col: "category" for col in raw_columns if col != 'Timestamp'}
+
+
+def read_survey_chunks(data_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       encoding: str = RAW_DATA_ENCODING, clean: bool = True):
+    """Yields the export chunk by chunk, cleaned with features.clean_survey unless clean is False."""
+    usecols = None if not clean else lambda col: col != 'Timestamp'
+    for chunk in pd.read_csv(data_path, chunksize=chunk_size, encoding=encoding, dtype=raw_dtypes, usecols=usecols):
+        yield clean_survey(chunk) if clean else chunk
+
+
+def write_parquet(chunks, output_path: Path) -> int:
+    """
+    Streams DataFrame chunks into one Parquet file and returns the number of rows written.
+    Categorical columns are stored dictionary-encoded with a common index type, so
+    chunks whose categories differ still share one schema.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = pa.schema([
+                    field.with_type(pa.dictionary(pa.int32(), pa.string()))
+                    if pa.types.is_dictionary(field.type) else field
+                    for field in table.schema
+                ]).with_metadata(table.schema.metadata)
+                writer = pq.ParquetWriter(output_path, schema)
+            writer.write_table(table.cast(schema))
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
+
+
+def ingest(data_path: Path, parquet_path: Path = None, csv_path: Path = None,
+           chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = RAW_DATA_ENCODING) -> int:
+    """Cleans a raw export in one streaming pass and writes it to the requested sinks."""
+    def tee(chunks):
+        first = True
+        for chunk in chunks:
+            if csv_path is not None:
+                chunk.to_csv(csv_path, mode="w" if first else "a", header=first, index=False)
+            first = False
+            yield chunk
+
+    chunks = tee(read_survey_chunks(data_path, chunk_size, encoding))
+    if parquet_path is not None:
+        return write_parquet(chunks, parquet_path)
+    return sum(len(chunk) for chunk in chunks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean a raw survey export in bounded memory.")
+    parser.add_argument("data", type=Path, help="Raw survey export CSV")
+    parser.add_argument("--parquet", type=Path, help="Cleaned Parquet output")
+    parser.add_argument("--csv", type=Path, help="Cleaned CSV output (same layout as cleaned_dataset.csv)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows read per chunk")
+    parser.add_argument("--encoding", default=RAW_DATA_ENCODING, help="Encoding of the export")
+    args = parser.parse_args(argv)
+    if args.parquet is None and args.csv is None:
+        parser.error("at least one of --parquet or --csv is required")
+
+    n_rows = ingest(args.data, args.parquet, args.csv, args.chunk_size, args.encoding)
+    print(f"Ingested {n_rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Precomputed predictions for every possible quiz submission.
+
+The quiz input space is closed (3 genders x 2^5 yes/no answers x 7 continents
+x 2 occupations = 1,344 combinations), so every answer set is scored once and
+stored in a flat array indexed by its mixed-radix code.
+
+Usage:
+    python lookup_table.py build  [--model PATH]
+    python lookup_table.py verify [--model PATH]
+"""
+import argparse
+import itertools
+from pathlib import Path
+import numpy as np
+from metrics import timed
+from utils import (DEFAULT_MODEL_PATH, feature_order, quiz_options, file_signature, get_model, model_input_rows,
+                   savez_atomic, shared_resource)
+
+# Number of options per feature and the stride of each feature in the code
+radices = [len(quiz_options[feature]) for feature in feature_order]
+strides = [int(np.prod(radices[i + 1:])) for i in range(len(radices))]
+n_combinations = int(np.prod(radices))
+
+_option_codes = {
+    feature: {option: code for code, option in enumerate(quiz_options[feature])}
+    for feature in feature_order
+}
+
+_lookup_registry = {}
+
+
+def encode_answers(answers: dict) -> int:
+    """
+    Returns the index of an answer set in the lookup table.
+    Raises KeyError if an answer is not one of the quiz options.
+    """
+    index = 0
+    for feature, stride in zip(feature_order, strides):
+        index += _option_codes[feature][answers[feature]] * stride
+    return index
+
+
+def decode_answers(index: int) -> dict:
+    """Inverse of encode_answers."""
+    answers = {}
+    for feature, stride, radix in zip(feature_order, strides, radices):
+        answers[feature] = quiz_options[feature][index // stride % radix]
+    return answers
+
+
+def quiz_space() -> list:
+    """Every quiz answer combination as a row in feature_order, in table order."""
+    return [list(row) for row in itertools.product(*(quiz_options[feature] for feature in feature_order))]
+
+
+def lookup_table_path(model_path: Path) -> Path:
+    model_path = Path(model_path)
+    return model_path.parent / ".cache" / f"{model_path.stem}.lookup.npz"
+
+
+def score_quiz_space(model_path: Path) -> np.ndarray:
+    """Live class 1 probabilities for the full quiz space, in table order."""
+    model = get_model(model_path)
+    return model.predict_proba(model_input_rows(quiz_space(), model.feature_names_))[:, 1]
+
+
+def build_table(model_path: Path = DEFAULT_MODEL_PATH) -> np.ndarray:
+    """
+    Scores the full quiz space in one predict_proba call and saves the table.
+    Models with more features than the quiz asks get utils.unasked_feature_defaults for the rest.
+    """
+    probabilities = score_quiz_space(model_path)
+    table_path = lookup_table_path(model_path)
+    table_path.parent.mkdir(parents=True, exist_ok=True)
+    savez_atomic(table_path, probabilities=probabilities, model_signature=np.array(file_signature(model_path)))
+    return probabilities
+
+
+def load_table(model_path: Path) -> np.ndarray:
+    """Loads the saved table, rebuilding it if it was built from a different model file."""
+    table_path = lookup_table_path(model_path)
+    if table_path.exists():
+        with np.load(table_path) as saved:
+            if tuple(saved["model_signature"]) == file_signature(model_path):
+                return saved["probabilities"]
+    return build_table(model_path)
+
+
+def get_table(model_path: Path = DEFAULT_MODEL_PATH) -> np.ndarray:
+    return shared_resource(_lookup_registry, model_path, load_table, "lookup_table")
+
+
+def lookup_probability(answers: dict, model_path: Path = DEFAULT_MODEL_PATH) -> float:
+    """Probability of class 1 for one quiz submission, without calling CatBoost."""
+    with timed("lookup_seconds"):
+        return float(get_table(model_path)[encode_answers(answers)])
+
+
+def verify_table(model_path: Path = DEFAULT_MODEL_PATH, atol: float = 1e-9) -> float:
+    """
+    Compares the table against live predict_proba over the full quiz space.
+    Returns the largest absolute difference; raises AssertionError above atol.
+    """
+    live = score_quiz_space(model_path)
+    max_diff = float(np.max(np.abs(get_table(model_path) - live)))
+    if max_diff > atol:
+        raise AssertionError(f"Lookup table differs from the live model by {max_diff}")
+    return max_diff
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or verify the quiz prediction lookup table.")
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH, help="Path to the .cbm model")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        table = build_table(args.model)
+        print(f"Stored {len(table)} predictions -> {lookup_table_path(args.model)}")
+    else:
+        max_diff = verify_table(args.model)
+        print(f"Lookup table matches the live model (max abs diff {max_diff:.3g})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Low-overhead timing, counters and per-request logs for the prediction hot path.
+
+Metrics are kept in process memory and rendered in the Prometheus text format,
+either by the HTTP service's /metrics endpoint or into METRICS_FILE after each
+Streamlit rerun. Environment toggles:
+
+    METRICS_ENABLED=0          disable all recording
+    METRICS_FILE=path          Prometheus text file rewritten by write_metrics_file()
+    PROFILE_SAMPLE_RATE=0.01   profile that fraction of reruns with cProfile
+    PROFILE_DIR=path           where sampled .prof files are written (default: profiles/)
+    REQUEST_LOG=0              disable the per-request JSON log lines
+    REQUEST_LOG_FILE=path      append request log lines to path instead of stderr
+"""
+import bisect
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+METRICS_FILE = os.environ.get("METRICS_FILE")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "profiles"))
+REQUEST_LOG = os.environ.get("REQUEST_LOG", "1") != "0"
+REQUEST_LOG_FILE = os.environ.get("REQUEST_LOG_FILE")
+
+buckets = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+request_logger = logging.getLogger("mental_health.requests")
+if REQUEST_LOG and not request_logger.handlers:
+    _handler = logging.FileHandler(REQUEST_LOG_FILE) if REQUEST_LOG_FILE else logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    request_logger.addHandler(_handler)
+    request_logger.setLevel(logging.INFO)
+    # One JSON object per line, not repeated through whatever the root logger is configured to do
+    request_logger.propagate = False
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())) if labels else ())
+
+
+def increment(name: str, amount: float = 1, **labels):
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name: str, seconds: float, **labels):
+    """Records one duration in the histogram name (seconds)."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    index = bisect.bisect_left(buckets, seconds)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * (len(buckets) + 1), "count": 0, "sum": 0.0}
+        histogram["buckets"][index] += 1
+        histogram["count"] += 1
+        histogram["sum"] += seconds
+
+
+@contextlib.contextmanager
+def timed(name: str, **labels):
+    """Times the enclosed block into the histogram name."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def _labels(labels: tuple, extra: dict = None) -> str:
+    items = list(labels) + list((extra or {}).items())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}" if items else ""
+
+
+def render_prometheus() -> str:
+    """All recorded metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: {**h, "buckets": list(h["buckets"])} for key, h in _histograms.items()}
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE {name} counter")
+        for (metric, labels), value in counters.items():
+            if metric == name:
+                lines.append(f"{name}{_labels(labels)} {value}")
+    for name in sorted({name for name, _ in histograms}):
+        lines.append(f"# TYPE {name} histogram")
+        for (metric, labels), histogram in histograms.items():
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip([*buckets, "+Inf"], histogram["buckets"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, {'le': bound})} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram['sum']}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path: str = None):
+    """Rewrites the Prometheus text file (METRICS_FILE by default) atomically."""
+    path = path or METRICS_FILE
+    if not path or not ENABLED:
+        return
+    path = Path(path)
+    # Unique per process and thread (as utils.temporary_path, which metrics cannot import)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp_path.write_text(render_prometheus())
+    tmp_path.replace(path)
+
+
+def log_request(**fields):
+    """
+    Emits one structured (JSON) log line describing a prediction request.
+    Log lines go to stderr by default: never pass quiz answers or anything that encodes them.
+    """
+    if ENABLED and request_logger.isEnabledFor(logging.INFO):
+        request_logger.info(json.dumps(fields, default=str))
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def start_sampled_profile(sample_rate: float = None):
+    """
+    Starts a cProfile profiler for a sample_rate fraction of calls (PROFILE_SAMPLE_RATE by default).
+    Returns the running profiler, or None when this call is not sampled.
+    """
+    sample_rate = PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+    if sample_rate <= 0 or random.random() >= sample_rate:
+        return None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def finish_sampled_profile(profiler, name: str):
+    """Stops a profiler from start_sampled_profile and writes its stats to PROFILE_DIR."""
+    if profiler is None:
+        return
+    profiler.disable()
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(PROFILE_DIR / f"{name}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}.prof")
+    increment("profiles_written_total", page=name)
+
+
+@contextlib.contextmanager
+def sampled_profile(name: str, sample_rate: float = None):
+    """Profiles the block for a sample_rate fraction of calls; the profiler is stopped even if the block raises."""
+    profiler = start_sampled_profile(sample_rate)
+    try:
+        yield profiler
+    finally:
+        finish_sampled_profile(profiler, name)
@@ -0,0 +1,129 @@
+"""
+Model card: feature importances and held-out evaluation stored next to the .cbm.
+
+The card is built once per model version (by train.py, or by this script from
+the same stratified split train.py uses) and pages/Model_Analysis.py renders it
+without loading the model. Each card records the SHA-256 of the .cbm it
+describes, so a card left over from another model is detected instead of shown.
+A card may also carry a reported_evaluation: the classification report recorded
+when the model was trained, shown (and labelled as such) until a held-out
+evaluation has been computed for that model version.
+
+Usage:
+    python model_card.py [--model PATH] [--data "Data/Mental Health Dataset.csv"]
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+import numpy as np
+from utils import DEFAULT_MODEL_PATH, get_model, shared_resource
+
+MAX_CURVE_POINTS = 200
+
+_card_registry = {}
+_digest_registry = {}
+
+
+def model_card_path(model_path: Path) -> Path:
+    model_path = Path(model_path)
+    return model_path.with_suffix(".card.json")
+
+
+def model_digest(model_path: Path) -> str:
+    return hashlib.sha256(Path(model_path).read_bytes()).hexdigest()
+
+
+def _thin(*curves) -> list:
+    """Evenly spaced points (always keeping both ends) so the stored curves stay small."""
+    n_points = len(curves[0])
+    keep = np.unique(np.linspace(0, n_points - 1, min(n_points, MAX_CURVE_POINTS)).astype(int))
+    return [np.asarray(curve)[keep].round(6).tolist() for curve in curves]
+
+
+def evaluation_card(model, X_test, y_test, threshold: float = 0.5) -> dict:
+    """Held-out classification report, confusion matrix, ROC/PR curves and LossFunctionChange importances."""
+    from catboost import Pool
+    from sklearn.metrics import (average_precision_score, classification_report, confusion_matrix,
+                                 precision_recall_curve, roc_auc_score, roc_curve)
+    probabilities = model.predict_proba(X_test)[:, 1]
+    y_pred = (probabilities >= threshold).astype(int)
+    fpr, tpr, _ = roc_curve(y_test, probabilities)
+    precision, recall, _ = precision_recall_curve(y_test, probabilities)
+    fpr, tpr = _thin(fpr, tpr)
+    precision, recall = _thin(precision, recall)
+    pool = Pool(X_test, y_test, cat_features=model.get_cat_feature_indices())
+    return {
+        "n_test_rows": len(y_test),
+        "threshold": threshold,
+        "classification_report": classification_report(y_test, y_pred, output_dict=True, zero_division=0),
+        "confusion_matrix": confusion_matrix(y_test, y_pred).tolist(),
+        "roc_curve": {"fpr": fpr, "tpr": tpr, "auc": float(roc_auc_score(y_test, probabilities))},
+        "pr_curve": {"precision": precision, "recall": recall,
+                     "average_precision": float(average_precision_score(y_test, probabilities))},
+        "loss_function_change": dict(zip(model.feature_names_,
+                                         model.get_feature_importance(pool, type="LossFunctionChange").tolist())),
+    }
+
+
+def build_model_card(model_path: Path = DEFAULT_MODEL_PATH, X_test=None, y_test=None) -> dict:
+    """
+    Computes the card for model_path and writes it next to the model.
+    Without held-out data only the PredictionValuesChange importances (which need no data) are computed,
+    and the existing card's reported_evaluation is kept if it describes the same model version.
+    """
+    model = get_model(model_path)
+    card = {
+        "model": Path(model_path).name,
+        "model_sha256": model_digest(model_path),
+        "tree_count": model.tree_count_,
+        "feature_importance": {
+            "PredictionValuesChange": dict(zip(model.feature_names_, model.get_feature_importance().tolist())),
+        },
+    }
+    if X_test is not None:
+        evaluation = evaluation_card(model, X_test, y_test)
+        card["feature_importance"]["LossFunctionChange"] = evaluation.pop("loss_function_change")
+        card["evaluation"] = evaluation
+    elif model_card_path(model_path).exists():
+        previous = load_model_card(model_card_path(model_path))
+        if previous["model_sha256"] == card["model_sha256"] and "reported_evaluation" in previous:
+            card["reported_evaluation"] = previous["reported_evaluation"]
+    model_card_path(model_path).write_text(json.dumps(card, indent=2))
+    return card
+
+
+def load_model_card(card_path: Path) -> dict:
+    with open(card_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_model_card(model_path: Path = DEFAULT_MODEL_PATH) -> dict:
+    """
+    The stored card for model_path.
+    Raises FileNotFoundError if it was never built and ValueError if it describes a different model.
+    """
+    card = shared_resource(_card_registry, model_card_path(model_path), load_model_card, "model_card")
+    if card["model_sha256"] != shared_resource(_digest_registry, model_path, model_digest, "model_digest"):
+        raise ValueError(f"{model_card_path(model_path)} was built for a different version of {Path(model_path).name}")
+    return card
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the model card shown on the Model Analysis page.")
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH, help="Path to the .cbm model")
+    parser.add_argument("--data", type=Path,
+                        help="Raw survey export or cleaned dataset; the held-out split is recreated as in train.py")
+    args = parser.parse_args(argv)
+
+    X_test = y_test = None
+    if args.data:
+        from train import load_training_data, split_features
+        _, X_test, _, y_test = split_features(load_training_data(args.data))
+    card = build_model_card(args.model, X_test, y_test)
+    print(f"Model card ({', '.join(card['feature_importance'])}"
+          f"{', held-out evaluation' if 'evaluation' in card else ''}) -> {model_card_path(args.model)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Standalone export of the CatBoost model and a NumPy evaluator for it.
+
+The .cbm is exported to CatBoost's JSON format (trees, one-hot values and CTR
+tables), and NumpyTreeModel reproduces predict_proba from that file without
+importing catboost. Categorical values are hashed with CatBoost's own string
+hash (the low 32 bits of CityHash64 v1.0), so values never seen in training or
+at export time score exactly as CatBoost scores them. ONNX is not used because
+CatBoost's ONNX export does not support categorical features.
+
+Usage:
+    python model_export.py export [--model PATH]
+    python model_export.py verify [--model PATH]
+"""
+import argparse
+import json
+import numbers
+import random
+import struct
+from pathlib import Path
+import numpy as np
+from utils import DEFAULT_MODEL_PATH, shared_resource
+
+_exported_registry = {}
+
+# CatBoost's hash combiner for CTR feature combinations (calc_hash in its Python export)
+_HASH_MULT = np.uint64(0x4906ba494954cb65)
+
+# CityHash64 v1.0 constants; CatBoost hashes categorical values with it (CalcCatFeatureHash)
+_MASK64 = (1 << 64) - 1
+_K0, _K1, _K2, _K3 = 0xc3a5c85c97cb3127, 0xb492b66fbe98f273, 0x9ae16a3b2f90404f, 0xc949d7c7509e6557
+_KMUL = 0x9ddfea08eb382d69
+
+# Off-quiz answers seen in the survey, plus one no model has seen, for verify_export
+probe_values = ["Maybe", "Not sure", "Missing", "Unknown", "Non-Professional", "Housewife", "never-seen-value"]
+
+
+def export_path(model_path: Path) -> Path:
+    model_path = Path(model_path)
+    return model_path.with_suffix(".json")
+
+
+def export_model(model_path: Path = DEFAULT_MODEL_PATH, output_path: Path = None, rows: list = None) -> Path:
+    """
+    Saves model_path in CatBoost's JSON format.
+    rows (default: the full quiz space, expanded by utils.model_input_rows for models with more features)
+    supplies the categorical values whose hashes are stored in the export, which NumpyTreeModel uses as a
+    ready-made cache; other values are hashed when first scored.
+    """
+    from catboost import Pool
+    from lookup_table import quiz_space
+    from utils import get_model, model_input_rows
+    output_path = Path(output_path or export_path(model_path))
+    model = get_model(model_path)
+    if rows is None:
+        rows = model_input_rows(quiz_space(), model.feature_names_)
+    pool = Pool(rows, cat_features=model.get_cat_feature_indices(), feature_names=model.feature_names_)
+    model.save_model(str(output_path), format="json", pool=pool)
+    return output_path
+
+
+def _combine_hashes(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return _HASH_MULT * (a + _HASH_MULT * b)
+
+
+def _fetch64(s: bytes, i: int) -> int:
+    return struct.unpack_from("<Q", s, i)[0]
+
+
+def _fetch32(s: bytes, i: int) -> int:
+    return struct.unpack_from("<I", s, i)[0]
+
+
+def _rotate(value: int, shift: int) -> int:
+    return value if shift == 0 else ((value >> shift) | (value << (64 - shift))) & _MASK64
+
+
+def _shift_mix(value: int) -> int:
+    return value ^ (value >> 47)
+
+
+def _hash_len16(u: int, v: int) -> int:
+    a = ((u ^ v) * _KMUL) & _MASK64
+    a ^= a >> 47
+    b = ((v ^ a) * _KMUL) & _MASK64
+    b ^= b >> 47
+    return (b * _KMUL) & _MASK64
+
+
+def _weak_hash_len32(s: bytes, i: int, a: int, b: int) -> tuple:
+    w, x, y, z = _fetch64(s, i), _fetch64(s, i + 8), _fetch64(s, i + 16), _fetch64(s, i + 24)
+    a = (a + w) & _MASK64
+    b = _rotate((b + a + z) & _MASK64, 21)
+    c = a
+    a = (a + x + y) & _MASK64
+    b = (b + _rotate(a, 44)) & _MASK64
+    return (a + z) & _MASK64, (b + c) & _MASK64
+
+
+def _city_hash64(s: bytes) -> int:
+    """CityHash64 v1.0, the version CatBoost uses for categorical feature values."""
+    n = len(s)
+    if n <= 16:
+        if n > 8:
+            a, b = _fetch64(s, 0), _fetch64(s, n - 8)
+            return _hash_len16(a, _rotate((b + n) & _MASK64, n)) ^ b
+        if n >= 4:
+            return _hash_len16((n + (_fetch32(s, 0) << 3)) & _MASK64, _fetch32(s, n - 4))
+        if n > 0:
+            y = s[0] + (s[n >> 1] << 8)
+            z = n + (s[n - 1] << 2)
+            return (_shift_mix(((y * _K2) ^ (z * _K3)) & _MASK64) * _K2) & _MASK64
+        return _K2
+    if n <= 32:
+        a = (_fetch64(s, 0) * _K1) & _MASK64
+        b = _fetch64(s, 8)
+        c = (_fetch64(s, n - 8) * _K2) & _MASK64
+        d = (_fetch64(s, n - 16) * _K0) & _MASK64
+        return _hash_len16((_rotate((a - b) & _MASK64, 43) + _rotate(c, 30) + d) & _MASK64,
+                           (a + _rotate(b ^ _K3, 20) - c + n) & _MASK64)
+    if n <= 64:
+        z = _fetch64(s, 24)
+        a = (_fetch64(s, 0) + (n + _fetch64(s, n - 16)) * _K0) & _MASK64
+        b, c = _rotate((a + z) & _MASK64, 52), _rotate(a, 37)
+        a = (a + _fetch64(s, 8)) & _MASK64
+        c = (c + _rotate(a, 7)) & _MASK64
+        a = (a + _fetch64(s, 16)) & _MASK64
+        vf, vs = (a + z) & _MASK64, (b + _rotate(a, 31) + c) & _MASK64
+        a = (_fetch64(s, 16) + _fetch64(s, n - 32)) & _MASK64
+        z = _fetch64(s, n - 8)
+        b, c = _rotate((a + z) & _MASK64, 52), _rotate(a, 37)
+        a = (a + _fetch64(s, n - 24)) & _MASK64
+        c = (c + _rotate(a, 7)) & _MASK64
+        a = (a + _fetch64(s, n - 16)) & _MASK64
+        wf, ws = (a + z) & _MASK64, (b + _rotate(a, 31) + c) & _MASK64
+        r = _shift_mix(((vf + ws) * _K2 + (wf + vs) * _K0) & _MASK64)
+        return (_shift_mix((r * _K0 + vs) & _MASK64) * _K2) & _MASK64
+
+    x, y, z = _fetch64(s, 0), _fetch64(s, n - 16) ^ _K1, _fetch64(s, n - 56) ^ _K0
+    v = _weak_hash_len32(s, n - 64, n, y)
+    w = _weak_hash_len32(s, n - 32, (n * _K1) & _MASK64, _K0)
+    z = (z + _shift_mix(v[1]) * _K1) & _MASK64
+    x = (_rotate((z + x) & _MASK64, 39) * _K1) & _MASK64
+    y = (_rotate(y, 33) * _K1) & _MASK64
+    for i in range(0, (n - 1) & ~63, 64):
+        x = (_rotate((x + y + v[0] + _fetch64(s, i + 16)) & _MASK64, 37) * _K1) & _MASK64
+        y = (_rotate((y + v[1] + _fetch64(s, i + 48)) & _MASK64, 42) * _K1) & _MASK64
+        x ^= w[1]
+        y ^= v[0]
+        z = _rotate(z ^ w[0], 33)
+        v = _weak_hash_len32(s, i, (v[1] * _K1) & _MASK64, (x + w[0]) & _MASK64)
+        w = _weak_hash_len32(s, i + 32, (z + w[1]) & _MASK64, y)
+        z, x = x, z
+    return _hash_len16((_hash_len16(v[0], w[0]) + _shift_mix(y) * _K1 + z) & _MASK64,
+                       (_hash_len16(v[1], w[1]) + x) & _MASK64)
+
+
+def cat_feature_hash(value) -> int:
+    """CatBoost's hash of a categorical value, as the sign-extended int32 its model compares against."""
+    if isinstance(value, numbers.Integral) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        raise ValueError(f"Categorical values must be strings or integers, got {value!r}")
+    return np.int32(np.uint32(_city_hash64(value.encode("utf-8")) & 0xffffffff)).item()
+
+
+class NumpyTreeModel:
+    """
+    Evaluates an exported CatBoost binary classifier built from one-hot and CTR splits
+    on categorical features (the only split types these models use).
+    """
+
+    def __init__(self, exported: dict):
+        features_info = exported["features_info"]
+        # Named like CatBoostClassifier.feature_names_ so either model can be handed to batch_scoring
+        self.feature_names_ = [feature["feature_name"] for feature in features_info["categorical_features"]]
+        # Hashes are stored as uint32 but compared and combined as sign-extended int32, as CatBoost does.
+        # Values hashed at export time seed the cache; any other value is hashed on first sight.
+        self.value_hashes = {item["value"]: np.int32(np.uint32(item["hash"])).item()
+                             for item in features_info.get("cat_features_hash", [])}
+
+        # Binary features in CatBoost's flat split_index order: one-hot values, then CTR borders
+        self._binary_features = []
+        for feature in features_info["categorical_features"]:
+            for value in feature.get("values", []):
+                self._binary_features.append(("one_hot", feature["flat_feature_index"], value))
+        self._ctrs = []
+        for ctr in features_info.get("ctrs", []):
+            elements = ctr["elements"]
+            if any(element["combination_element"] not in ("cat_feature_value", "cat_feature_exact_value")
+                   for element in elements):
+                raise ValueError(f"Unsupported CTR projection: {ctr['identifier']}")
+            self._ctrs.append({
+                "cat_features": [element["cat_feature_index"] for element in elements
+                                 if element["combination_element"] == "cat_feature_value"],
+                # One-hot conditions in the projection ("feature == value"), hashed in after the plain features
+                "exact_values": [(element["cat_feature_index"], element["value"]) for element in elements
+                                 if element["combination_element"] == "cat_feature_exact_value"],
+                "type": ctr["ctr_type"],
+                "table": self._ctr_table(exported["ctr_data"][ctr["identifier"]]),
+                "prior_numerator": ctr["prior_numerator"],
+                "prior_denominator": ctr["prior_denomerator"],
+                "shift": ctr["shift"],
+                "scale": ctr["scale"],
+            })
+            for border in ctr["borders"]:
+                self._binary_features.append(("ctr", len(self._ctrs) - 1, border))
+
+        trees = exported["oblivious_trees"]
+        self._split_indices = [[split["split_index"] for split in tree["splits"] or []] for tree in trees]
+        self._leaf_values = [np.asarray(tree["leaf_values"], dtype=float) for tree in trees]
+        self.scale, biases = exported["scale_and_bias"]
+        self.bias = biases[0]
+        self.tree_count = len(trees)
+
+    @staticmethod
+    def _ctr_table(ctr_data: dict) -> tuple:
+        """(sorted projection hashes, per-hash counts, counter denominator) from one ctr_data entry."""
+        stride = ctr_data["hash_stride"]
+        hash_map = ctr_data["hash_map"]
+        hashes = np.array([int(h) for h in hash_map[0::stride]], dtype=np.uint64)
+        counts = np.array([hash_map[i + 1:i + stride] for i in range(0, len(hash_map), stride)], dtype=float)
+        order = np.argsort(hashes)
+        return hashes[order], counts[order], ctr_data.get("counter_denominator", 0)
+
+    @classmethod
+    def from_json(cls, path: Path) -> "NumpyTreeModel":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _value_hash(self, value) -> int:
+        try:
+            return self.value_hashes[value]
+        except KeyError:
+            self.value_hashes[value] = cat_feature_hash(value)
+            return self.value_hashes[value]
+
+    def hash_rows(self, rows) -> np.ndarray:
+        """(n_rows, n_features) int64 category hashes; raises ValueError for a value CatBoost would reject."""
+        rows = np.asarray(rows, dtype=object)  # DataFrames, lists of rows and arrays alike
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        hashed = np.empty(rows.shape, dtype=np.int64)
+        for j, name in enumerate(self.feature_names_):
+            try:
+                hashed[:, j] = [self._value_hash(value) for value in rows[:, j]]
+            except ValueError as e:
+                raise ValueError(f"{name}: {e}") from None
+        return hashed
+
+    def _ctr_values(self, ctr: dict, hashed: np.ndarray) -> np.ndarray:
+        projection = np.zeros(len(hashed), dtype=np.uint64)
+        for index in ctr["cat_features"]:
+            projection = _combine_hashes(projection, hashed[:, index].astype(np.uint64))
+        for index, value in ctr["exact_values"]:
+            projection = _combine_hashes(projection, (hashed[:, index] == value).astype(np.uint64))
+        hashes, counts, denominator = ctr["table"]
+        position = np.minimum(np.searchsorted(hashes, projection), len(hashes) - 1)
+        found = hashes[position] == projection
+
+        if ctr["type"] == "Counter":
+            count = np.where(found, counts[position, 0], 0.0)
+            total = np.where(found, denominator, 0.0)
+        else:
+            # Binary-target Borders/Buckets CTR: counts are (class 0, class 1)
+            count = np.where(found, counts[position, 1], 0.0)
+            total = np.where(found, counts[position].sum(axis=1), 0.0)
+        return ((count + ctr["prior_numerator"]) / (total + ctr["prior_denominator"]) + ctr["shift"]) * ctr["scale"]
+
+    def binarize(self, hashed: np.ndarray) -> np.ndarray:
+        """(n_binary_features, n_rows) uint8 matrix of every split condition."""
+        ctr_values = [self._ctr_values(ctr, hashed) for ctr in self._ctrs]
+        binary = np.empty((len(self._binary_features), len(hashed)), dtype=np.uint8)
+        for i, (kind, index, value) in enumerate(self._binary_features):
+            if kind == "one_hot":
+                binary[i] = hashed[:, index] == value
+            else:
+                binary[i] = ctr_values[index] > value
+        return binary
+
+    def predict_raw(self, rows) -> np.ndarray:
+        binary = self.binarize(self.hash_rows(rows))
+        raw = np.zeros(binary.shape[1])
+        leaf = np.empty(binary.shape[1], dtype=np.uint8)
+        for split_indices, leaf_values in zip(self._split_indices, self._leaf_values):
+            # Oblivious tree: split d of the tree sets bit d of the leaf index
+            leaf[:] = 0
+            for depth, split_index in enumerate(split_indices):
+                leaf |= binary[split_index] << depth
+            raw += leaf_values[leaf]
+        return self.scale * raw + self.bias
+
+    def predict_proba(self, rows) -> np.ndarray:
+        """(n_rows, 2) class probabilities for rows in model feature order, like CatBoostClassifier.predict_proba."""
+        p = 1.0 / (1.0 + np.exp(-self.predict_raw(rows)))
+        return np.column_stack([1.0 - p, p])
+
+
+def get_exported_model(model_path: Path = DEFAULT_MODEL_PATH) -> NumpyTreeModel:
+    """Shared NumpyTreeModel for model_path's JSON export (see export_model)."""
+    return shared_resource(_exported_registry, export_path(model_path), NumpyTreeModel.from_json, "exported_model")
+
+
+def probe_rows(rows: list, n_per_value: int = 5, seed: int = 0) -> list:
+    """Copies of random rows with one feature set to each of probe_values, to exercise unseen categories."""
+    rng = random.Random(seed)
+    probes = []
+    for j in range(len(rows[0])):
+        for value in probe_values:
+            for row in rng.sample(rows, min(n_per_value, len(rows))):
+                probes.append([*row[:j], value, *row[j + 1:]])
+    return probes
+
+
+def verify_export(model_path: Path = DEFAULT_MODEL_PATH, rows: list = None, atol: float = 1e-9) -> float:
+    """
+    Compares the NumPy evaluator with CatBoost's predict_proba over rows (default: the full quiz space,
+    expanded by utils.model_input_rows for models with more features) plus copies of them carrying off-quiz
+    and never-seen answers (see probe_rows), and checks the export's stored hashes against cat_feature_hash.
+    Returns the largest absolute difference; raises AssertionError above atol.
+    """
+    from lookup_table import quiz_space
+    from utils import get_model, model_input_rows
+    model = get_model(model_path)
+    exported = get_exported_model(model_path)
+    if exported.feature_names_ != model.feature_names_:
+        raise AssertionError(f"Exported feature order {exported.feature_names_} differs from {model.feature_names_}")
+    if rows is None:
+        rows = model_input_rows(quiz_space(), model.feature_names_)
+    rows = [list(row) for row in rows]
+    rows += probe_rows(rows)
+
+    with open(export_path(model_path), encoding="utf-8") as f:
+        stored_hashes = json.load(f)["features_info"].get("cat_features_hash", [])
+    for item in stored_hashes:
+        if cat_feature_hash(item["value"]) != np.int32(np.uint32(item["hash"])):
+            raise AssertionError(f"Hash of {item['value']!r} differs from CatBoost's")
+
+    live = model.predict_proba(rows)[:, 1]
+    max_diff = float(np.max(np.abs(exported.predict_proba(rows)[:, 1] - live)))
+    if max_diff > atol:
+        raise AssertionError(f"NumPy evaluator differs from CatBoost by {max_diff}")
+    return max_diff
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the model to JSON or check the NumPy evaluator against it.")
+    parser.add_argument("command", choices=["export", "verify"])
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH, help="Path to the .cbm model")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        print(f"Exported {args.model} -> {export_model(args.model)}")
+    else:
+        max_diff = verify_export(args.model)
+        print(f"NumPy evaluator matches CatBoost over the quiz space and unseen answers (max abs diff {max_diff:.3g})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+A/B and shadow routing between the two shipped models.
+
+Each prediction is served by the primary model (model2) or, for a configurable
+share of traffic, by the secondary full-feature model. In shadow mode a
+background thread scores every request with both live models, so the
+user-facing response never waits for it. That thread times each model's own
+predict_proba call (model_latency_seconds), independent of how the response was
+served (routed_latency_seconds: a lookup-table index or a micro-batched live
+call), and compares the other model's answer with the served one. Callers with
+several submissions (the service's batched requests) use predict_many, which
+groups them by routed model and awaits the live scheduler's futures instead of
+blocking on one row at a time. Environment toggles:
+
+    ROUTER_SECONDARY_MODEL=path   secondary .cbm (default: models/Mental_Health_Prediction_model.cbm)
+    ROUTER_SECONDARY_SHARE=0.1    fraction of requests served by the secondary model
+    ROUTER_SHADOW=1               shadow-score every request with both live models
+    ROUTER_ENGINE=live            serve from the live models through inference_scheduler
+                                  instead of their lookup tables (the default, 'table')
+"""
+import asyncio
+import os
+import random
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from inference_scheduler import get_scheduler
+from lookup_table import encode_answers, get_table, lookup_probability
+from metrics import increment, observe, timed
+from utils import DEFAULT_MODEL_PATH, get_encoder, get_model, model_answers
+
+SECONDARY_MODEL_PATH = Path(__file__).parent / "models" / "Mental_Health_Prediction_model.cbm"
+THRESHOLD = 0.5
+MAX_PENDING_SHADOW = 1000
+
+_routers = {}
+_routers_lock = threading.Lock()
+
+
+class ModelRouter:
+    def __init__(self, primary_path: Path = DEFAULT_MODEL_PATH, secondary_path: Path = None,
+                 secondary_share: float = 0.0, shadow: bool = False, engine: str = "table", seed: int = None):
+        if not 0.0 <= secondary_share <= 1.0:
+            raise ValueError("secondary_share must be between 0 and 1")
+        if (secondary_share or shadow) and secondary_path is None:
+            raise ValueError("A secondary model is required for A/B or shadow routing")
+        if engine not in ("table", "live"):
+            raise ValueError(f"Unknown engine: {engine}")
+        self.primary_path = Path(primary_path)
+        self.secondary_path = Path(secondary_path) if secondary_path is not None else None
+        self.secondary_share = secondary_share
+        self.shadow = shadow
+        self.engine = engine
+        self._random = random.Random(seed)
+        self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scoring") if shadow else None
+        self._stats_lock = threading.Lock()
+        self._pending_shadow = 0
+        self._comparisons = {}
+
+    @property
+    def enabled(self) -> bool:
+        """True when requests can reach the secondary model at all."""
+        return bool(self.secondary_share or self.shadow)
+
+    def choose(self) -> Path:
+        if self.secondary_share and self._random.random() < self.secondary_share:
+            return self.secondary_path
+        return self.primary_path
+
+    def score(self, model_path: Path, answers: dict) -> float:
+        """Class 1 probability of one quiz submission under model_path, as served by the configured engine."""
+        with timed("routed_latency_seconds", model=model_path.stem, engine=self.engine):
+            if self.engine == "table":
+                return lookup_probability(answers, model_path)
+            return get_scheduler(model_path).predict_proba(answers)
+
+    @staticmethod
+    def live_score(model_path: Path, answers: dict) -> float:
+        """Class 1 probability from model_path's own predict_proba, timing only that call."""
+        row = get_encoder(model_path).encode(model_answers(answers))
+        model = get_model(model_path)
+        with timed("model_latency_seconds", model=model_path.stem):
+            return float(model.predict_proba(row)[0, 1])
+
+    def predict(self, answers: dict) -> dict:
+        """
+        Scores answers with the routed model and, in shadow mode, queues the other model.
+        Returns {'model': served model name, 'model_path': its .cbm, 'probability': class 1 probability}.
+        """
+        served = self.choose()
+        return self._routed(served, answers, self.score(served, answers))
+
+    async def predict_many(self, answers_list: list) -> list:
+        """
+        predict() for several submissions without blocking the event loop: each is routed first, then
+        every live submission is queued on its model's scheduler at once and their futures are awaited.
+        """
+        served = [self.choose() for _ in answers_list]
+        groups = {}
+        for i, model_path in enumerate(served):
+            groups.setdefault(model_path, []).append(i)
+
+        started = time.perf_counter()
+        probabilities = [None] * len(answers_list)
+        pending = {}
+        for model_path, indices in groups.items():
+            group_answers = [answers_list[i] for i in indices]
+            if self.engine == "table":
+                scored = get_table(model_path)[[encode_answers(answers) for answers in group_answers]]
+                for i, probability in zip(indices, scored):
+                    probabilities[i] = float(probability)
+                self._observe_routed(model_path, len(indices), time.perf_counter() - started)
+            else:
+                pending[model_path] = get_scheduler(model_path).submit_many(group_answers)
+        for model_path, futures in pending.items():
+            scored = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+            for i, probability in zip(groups[model_path], scored):
+                probabilities[i] = probability
+            self._observe_routed(model_path, len(futures), time.perf_counter() - started)
+        return [self._routed(model_path, answers, probability)
+                for model_path, answers, probability in zip(served, answers_list, probabilities)]
+
+    def _observe_routed(self, model_path: Path, n_rows: int, seconds: float):
+        for _ in range(n_rows):
+            observe("routed_latency_seconds", seconds, model=model_path.stem, engine=self.engine)
+
+    def _routed(self, served: Path, answers: dict, probability: float) -> dict:
+        increment("routed_predictions_total", model=served.stem)
+        if self.shadow:
+            self._submit_shadow(self.secondary_path if served == self.primary_path else self.primary_path,
+                                served, answers, probability)
+        return {"model": served.stem, "model_path": served, "probability": probability}
+
+    def _submit_shadow(self, shadow_path: Path, served: Path, answers: dict, served_probability: float):
+        with self._stats_lock:
+            if self._pending_shadow >= MAX_PENDING_SHADOW:
+                increment("shadow_dropped_total", model=shadow_path.stem)
+                return
+            self._pending_shadow += 1
+        self._shadow_executor.submit(self._shadow_score, shadow_path, served, answers, served_probability)
+
+    def _shadow_score(self, shadow_path: Path, served: Path, answers: dict, served_probability: float):
+        try:
+            self.live_score(served, answers)
+            probability = self.live_score(shadow_path, answers)
+        except Exception:
+            increment("shadow_errors_total", model=shadow_path.stem)
+            return
+        finally:
+            with self._stats_lock:
+                self._pending_shadow -= 1
+        agree = (probability >= THRESHOLD) == (served_probability >= THRESHOLD)
+        increment("shadow_comparisons_total", served=served.stem, shadow=shadow_path.stem, agree=str(agree).lower())
+        with self._stats_lock:
+            counts = self._comparisons.setdefault((served.stem, shadow_path.stem), [0, 0, 0.0])
+            counts[0] += 1
+            counts[1] += agree
+            counts[2] += abs(probability - served_probability)
+
+    def stats(self) -> dict:
+        """Shadow agreement rate and mean absolute probability difference per (served, shadow) pair."""
+        with self._stats_lock:
+            return {
+                f"{served}->{shadow}": {
+                    "comparisons": compared,
+                    "agreement_rate": agreed / compared,
+                    "mean_abs_difference": difference / compared,
+                }
+                for (served, shadow), (compared, agreed, difference) in self._comparisons.items()
+            }
+
+    def close(self):
+        if self._shadow_executor is not None:
+            self._shadow_executor.shutdown(wait=True)
+
+
+def router_from_env(primary_path: Path = DEFAULT_MODEL_PATH) -> ModelRouter:
+    return ModelRouter(
+        primary_path,
+        secondary_path=Path(os.environ.get("ROUTER_SECONDARY_MODEL", SECONDARY_MODEL_PATH)),
+        secondary_share=float(os.environ.get("ROUTER_SECONDARY_SHARE", 0)),
+        shadow=os.environ.get("ROUTER_SHADOW", "0") == "1",
+        engine=os.environ.get("ROUTER_ENGINE", "table"),
+    )
+
+
+def get_router(primary_path: Path = DEFAULT_MODEL_PATH) -> ModelRouter:
+    """Returns the process-wide router for primary_path, configured from the environment on first use."""
+    key = str(Path(primary_path).resolve())
+    with _routers_lock:
+        if key not in _routers:
+            _routers[key] = router_from_env(primary_path)
+        return _routers[key]
@@ -1,10 +1,8 @@
 import streamlit as st
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import plotly.express as px
 from pathlib import Path
-from utils import load_data,display_feature_insight,display_treatment_feature
+from utils import display_data_preview,display_feature_insight,display_treatment_feature
+from eda_aggregates import get_aggregates,eda_features
+from association_stats import summary_from_tables
 import altair as alt
 
 st.set_page_config(page_title=" Mental Health Predictor Dashboard", layout="wide")
@@ -13,10 +11,11 @@ st.markdown("<h1> Mental Health Predictor App - EDA Dashboard </h1>",unsafe_allo
 # st.divider()
 
 original_data_path = Path("Data/Mental Health Dataset.csv")
-original_data = load_data(original_data_path)
-
 cleaned_data_path = Path("Data/cleaned_dataset.csv")
-cleaned_data = load_data(cleaned_data_path)
+
+# Every chart below renders from precomputed aggregates; the raw frames are only
+# loaded when a preview expander is opened.
+aggregates = get_aggregates(original_data_path)
 
 st.write("This Dashboard provides insights to the Exploratory Data Analysis on the Mental Heath Dataset on Kaggle ")
 # st.markdown("<br>", unsafe_allow_html=True)
@@ -24,15 +23,17 @@ st.subheader("Dataset Preview" , divider="red")
 st.markdown("<br>",unsafe_allow_html=True)
 st.write("Original Dataset")
 
-with st.expander("View Original Data"):
-    st.dataframe(original_data)
+with st.expander("View Original Data", key="original_data_preview", on_change="rerun") as original_preview:
+    if original_preview.open:
+        display_data_preview(original_data_path, key="original_data")
 
 st.markdown("<br>",unsafe_allow_html=True)
 
 st.write("Dataset after EDA")
 
-with st.expander("View Data"):
-    st.dataframe(cleaned_data)
+with st.expander("View Data", key="cleaned_data_preview", on_change="rerun") as cleaned_preview:
+    if cleaned_preview.open:
+        display_data_preview(cleaned_data_path, key="cleaned_data")
  
 st.markdown("<br>",unsafe_allow_html=True)
 
@@ -44,7 +45,7 @@ st.subheader("Data Cleaning",divider="red")
 st.markdown("<h4> Handling Missing Values</h4>", unsafe_allow_html=True)
 
 with st.expander("View Missing Values"):
-    st.dataframe(original_data.isnull().sum())
+    st.dataframe(aggregates["missing_values"])
 
 st.write("Since 'Self-employed' is an important predictor, we imputed its missing values by introducing a new category labeled 'Missing'. This allows the model to learn from the absence of data as a separate class.  ")
 
@@ -73,12 +74,12 @@ st.markdown("<br>",unsafe_allow_html=True)
 
 col1, col2 = st.columns(2)
 with col1:
-    country_counts = original_data['Country'].value_counts()
+    country_counts = aggregates["country_counts"]
     st.bar_chart(country_counts,y_label="Frequency")
     st.markdown("<h6 style='text-align: center;'>Country Distribution</h6>", unsafe_allow_html=True)
 
 with col2:
-    continent_counts = cleaned_data['Continent'].value_counts()
+    continent_counts = aggregates["value_counts"]["Continent"].sort_values(ascending=False)
     st.bar_chart(continent_counts,y_label="Frequency")
     st.markdown("<h6 style='text-align: center;'>Continent Distribution</h6>", unsafe_allow_html=True)
 
@@ -95,12 +96,12 @@ st.markdown("<br>",unsafe_allow_html=True)
 
 col1, col2 = st.columns(2)
 with col1:
-    country_counts = original_data['Occupation'].value_counts().sort_index()
+    country_counts = aggregates["occupation_counts"]
     st.bar_chart(country_counts,y_label="Frequency")
     st.markdown("<h6 style='text-align: center;'>Occupation Distribution</h6>", unsafe_allow_html=True)
 
 with col2:
-    continent_counts = cleaned_data['Occupation_Category'].value_counts()
+    continent_counts = aggregates["value_counts"]["Occupation_Category"].sort_values(ascending=False)
     st.bar_chart(continent_counts,y_label="Frequency")
     st.markdown("<h6 style='text-align: center;'>Category-wise Distribution</h6>", unsafe_allow_html=True)
 
@@ -115,15 +116,10 @@ st.write(""" The `Occupation` field contained many distinct values, which can in
 
 st.subheader("Univariate Analysis",divider="red")
 st.markdown("<h5> Visualization </h5>",unsafe_allow_html=True)
-features = [
-    "Gender","self_employed", "family_history",
-    "Days_Indoors", "Growing_Stress", "Changes_Habits", "Mental_Health_History",
-    "Mood_Swings", "Coping_Struggles", "Work_Interest", "Social_Weakness",
-    "mental_health_interview", "care_options", "Continent","Occupation_Category"
-]
+features = eda_features
 
 selected_feature = st.selectbox("Choose a feature to examine its univariate distribution:", features)
-feature_counts = cleaned_data[selected_feature].value_counts().sort_index()
+feature_counts = aggregates["value_counts"][selected_feature]
 
 feature_df = feature_counts.reset_index()
 feature_df.columns = [selected_feature, "Frequency"]
@@ -142,18 +138,12 @@ st.markdown("<h5> Visualization </h5>",unsafe_allow_html=True)
 
 
 
-features = [
-    "Gender","self_employed", "family_history",
-    "Days_Indoors", "Growing_Stress", "Changes_Habits", "Mental_Health_History",
-    "Mood_Swings", "Coping_Struggles", "Work_Interest", "Social_Weakness",
-    "mental_health_interview", "care_options", "Continent","Occupation_Category"
-]
-
 feature_selected= st.selectbox("Compare 'treatment' with:", features)
 
-grouped = cleaned_data.groupby([feature_selected, 'treatment']).size().unstack(fill_value=0)
+grouped = aggregates["treatment_counts"][feature_selected].copy()
 grouped.columns = ['No (Treatment)', 'Yes (Treatment)']
-grouped_percent = grouped.div(grouped.sum(axis=1), axis=0) * 100
+grouped_percent = aggregates["treatment_percent"][feature_selected].copy()
+grouped_percent.columns = grouped.columns
 
 
 
@@ -198,13 +188,15 @@ By combining both the Chi-Square test and Cramér’s V, we can identify which f
 
 st.markdown("<br>",unsafe_allow_html=True)
 st.markdown("<h4>Table Summarizing the Chi-sq and Cramer's V Values</h4>",unsafe_allow_html=True)
-chi2_cramers_df = pd.read_csv("Data/chi2_cramersv_summary.csv", index_col=0)
+# Computed from the cached feature x treatment crosstabs, so it always matches the data
+chi2_cramers_df = summary_from_tables(aggregates["treatment_counts"])
 
 
 st.dataframe(chi2_cramers_df.style.format({
     "Chi2_Statistic": "{:.2f}",
     "P_Value": "{:.6f}",
-    "Cramers_V": "{:.4f}"
+    "Cramers_V": "{:.4f}",
+    "Mutual_Info": "{:.6f}"
 }).background_gradient(cmap='YlOrRd', subset=["Cramers_V"]))
 
 st.markdown("<br>",unsafe_allow_html=True)
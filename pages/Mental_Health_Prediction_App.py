@@ -1,27 +1,60 @@
 import streamlit as st
 import pandas as pd
-import joblib
-from utils import preprocess_input ,load_model
-
-model_path = "models/Mental_Health_Prediction_model2.cbm"
-
-model = load_model(model_path)
-
-
-st.set_page_config(
-    page_title="Mental Health Prediction App",
-    layout="centered",
-    initial_sidebar_state="collapsed"
-)
-
-st.title("Mental Health Prediction App")
-
-st.markdown("""
+import time
+import uuid
+from utils import gender_options ,yes_no ,continent_options ,occupation_options
+from lookup_table import get_table ,encode_answers
+from explanations import get_shap_table ,explain
+from model_router import get_router
+from result_store import get_result_store
+from metrics import increment ,log_request ,observe ,write_metrics_file ,sampled_profile
+
+page_started = time.perf_counter()
+
+# A sampled fraction of reruns is profiled; the profiler is stopped even if the rerun raises
+with sampled_profile("prediction_page"):
+    model_path = "models/Mental_Health_Prediction_model2.cbm"
+
+    # Precomputed predictions and SHAP contributions for every quiz answer combination
+    get_table(model_path)
+    get_shap_table(model_path)
+
+    # Serves model2, or the full-feature model for an A/B share of traffic (see model_router.py)
+    router = get_router(model_path)
+    if router.enabled:
+        get_table(router.secondary_path)
+        get_shap_table(router.secondary_path)
+
+    # Past results, kept per browser session without rescoring, only for visitors who opt in below
+    result_store = get_result_store()
+    session_id = st.session_state.setdefault("result_session_id", uuid.uuid4().hex)
+
+    answer_labels = {
+        'Gender': "Gender",
+        'self_employed': "Self-employed",
+        'family_history': "Family history of mental illness",
+        'Mental_Health_History': "History of mental health issues",
+        'mental_health_interview': "Comfortable discussing mental health",
+        'care_options': "Aware of workplace care options",
+        'Continent': "Continent",
+        'Occupation_Category': "Occupation",
+    }
+
+
+    st.set_page_config(
+        page_title="Mental Health Prediction App",
+        layout="centered",
+        initial_sidebar_state="collapsed"
+    )
+
+    st.title("Mental Health Prediction App")
+
+    st.markdown("""
 <h5>This quiz is designed to assess your mental health state based on a predictive model trained on the 
 <a href="https://www.kaggle.com/datasets/osmi/mental-health-in-tech-survey" target="_blank">Mental Health in Tech Survey</a> dataset from Kaggle.</h5>
 """, unsafe_allow_html=True)
 
-st.markdown("""
+    st.markdown("""
 <h4> Disclaimer</h4>
 <p style='font-size:16px;'>
 This application provides a predictive insight based on the Mental Health in Tech Survey dataset and a machine learning model trained on it.
@@ -31,72 +64,96 @@ If you are experiencing mental health issues, we strongly encourage you to seek
 </p>
 """, unsafe_allow_html=True)
 
-feature_order = [
-    'Gender',
-    'self_employed',
-    'family_history',
-    'Mental_Health_History',
-    'mental_health_interview',
-    'care_options',
-    'Continent',
-    'Occupation_Category'
-]
-
-gender_options = ["Male", "Female", "Other"]
-yes_no = ["Yes", "No"]
-continent_options = ["Asia", "Europe", "North America", "South America", "Africa", "Oceania", "Antarctica"]
-occupation_options = ["Professional","Non-professional"]
-
-
-with st.form("mental_health_quiz"):
-    gender = st.selectbox("What is your gender?", gender_options)
-    self_employed = st.selectbox("Are you self-employed?", yes_no)
-    family_history = st.selectbox("Any family history of mental illness?", yes_no)
-    personal_history = st.selectbox("Do you have a history of mental health issues?", yes_no)
-    comfortable_interview = st.selectbox("Are you comfortable discussing mental health in interviews or talking openly about it ?", yes_no)
-    care_options = st.selectbox("Are you aware of mental health care options available at your workplace? ", yes_no)
-    continent = st.selectbox("Which continent are you located in?", continent_options)
-    occupation = st.selectbox("Which category best describes your occupation?", occupation_options)
-
-    submitted = st.form_submit_button("Predict")
-
-    if submitted:
-        user_answers = {
-            'Gender': gender,
-            'self_employed': self_employed,
-            'family_history': family_history,
-            'Mental_Health_History': personal_history,
-            'mental_health_interview': comfortable_interview,
-            'care_options': care_options,
-            'Continent': continent,
-            'Occupation_Category': occupation
-        }
-
-        # Preprocess input using utility function
-        input_df = preprocess_input(user_answers, feature_order)
-        
-        # # Make prediction
-        # prediction = model.predict(input_df)[0]
-
-        # # Display result
-        # if prediction == 1:
-        #     st.success(" Based on your responses, you may benefit from mental health support. Consider seeking professional help.")
-        # else:
-        #     st.info(" You're not currently flagged for needing assistance, but staying mindful and proactive is always helpful.")
-
-        prediction_proba = model.predict_proba(input_df)[0][1]  # Probability of class 1
-        prediction = int(prediction_proba >= 0.5)
-        confidence_percent = prediction_proba * 100
-
-        # --- Display Results ---
-        st.markdown("## 🧠 Prediction Result")
-
-        if prediction == 1:
-            st.success("🩺 **Prediction:** You may benefit from **mental health treatment**.")
-        else:
-            st.info("✅ **Prediction:** No immediate need for mental health treatment detected.")
-
-        st.markdown("### 🔍 Model Confidence")
-        st.metric(label="Likelihood of Needing Treatment", value=f"{confidence_percent:.2f}%")
-        st.progress(prediction_proba)
 
+    with st.form("mental_health_quiz"):
+        gender = st.selectbox("What is your gender?", gender_options)
+        self_employed = st.selectbox("Are you self-employed?", yes_no)
+        family_history = st.selectbox("Any family history of mental illness?", yes_no)
+        personal_history = st.selectbox("Do you have a history of mental health issues?", yes_no)
+        comfortable_interview = st.selectbox("Are you comfortable discussing mental health in interviews or talking openly about it ?", yes_no)
+        care_options = st.selectbox("Are you aware of mental health care options available at your workplace? ", yes_no)
+        continent = st.selectbox("Which continent are you located in?", continent_options)
+        occupation = st.selectbox("Which category best describes your occupation?", occupation_options)
+
+        save_result = st.checkbox(
+            "Save my answers and result on this server so I can compare my earlier results",
+            value=False,
+            help="When checked, your answers and predicted likelihood are stored on the server together with "
+                 "a random identifier for this browser session. Nothing is stored when it is left unchecked, "
+                 "and only you see your saved results.",
+        )
+
+        submitted = st.form_submit_button("Predict")
+
+        if submitted:
+            user_answers = {
+                'Gender': gender,
+                'self_employed': self_employed,
+                'family_history': family_history,
+                'Mental_Health_History': personal_history,
+                'mental_health_interview': comfortable_interview,
+                'care_options': care_options,
+                'Continent': continent,
+                'Occupation_Category': occupation
+            }
+
+            # # Make prediction
+            # prediction = model.predict(input_df)[0]
+
+            # # Display result
+            # if prediction == 1:
+            #     st.success(" Based on your responses, you may benefit from mental health support. Consider seeking professional help.")
+            # else:
+            #     st.info(" You're not currently flagged for needing assistance, but staying mindful and proactive is always helpful.")
+
+            routed = router.predict(user_answers)
+            prediction_proba = routed["probability"]  # Probability of class 1
+            prediction = int(prediction_proba >= 0.5)
+            if save_result:
+                result_store.append(session_id, encode_answers(user_answers), prediction_proba)
+            increment("predictions_total", source="page")
+            # No answers or answer_code: decode_answers would turn it back into the user's quiz answers
+            log_request(page="prediction", model=routed["model"], probability=round(prediction_proba, 6),
+                        prediction=prediction)
+            confidence_percent = prediction_proba * 100
+
+            # --- Display Results ---
+            st.markdown("## 🧠 Prediction Result")
+
+            if prediction == 1:
+                st.success("🩺 **Prediction:** You may benefit from **mental health treatment**.")
+            else:
+                st.info("✅ **Prediction:** No immediate need for mental health treatment detected.")
+
+            st.markdown("### 🔍 Model Confidence")
+            st.metric(label="Likelihood of Needing Treatment", value=f"{confidence_percent:.2f}%")
+            st.progress(prediction_proba)
+
+            # Looked up from the precomputed SHAP table of the model that served this prediction
+            explanation = explain(user_answers, routed["model_path"])
+            st.markdown("### 🧩 Which Answers Moved Your Score")
+            for item in explanation["contributions"]:
+                if abs(item["contribution"]) < 0.01:
+                    continue
+                direction = "⬆️ raised" if item["contribution"] > 0 else "⬇️ lowered"
+                st.markdown(f"- **{answer_labels[item['feature']]}: {item['answer']}** {direction} your score "
+                            f"({item['contribution']:+.2f})")
+            st.caption("Contributions are SHAP values in log-odds, relative to the model's average prediction.")
+
+    history = result_store.history(session_id, limit=10)
+    if history:
+        st.markdown("### 🕘 Your Previous Results")
+        st.dataframe(pd.DataFrame([
+            {
+                "Submitted": pd.to_datetime(result["timestamp"], unit="s").strftime("%Y-%m-%d %H:%M:%S UTC"),
+                "Likelihood": f"{result['probability'] * 100:.2f}%",
+                **result["answers"],
+            }
+            for result in history
+        ]), hide_index=True)
+        stats = result_store.session_stats(session_id)
+        st.caption(f"Across your {stats['submissions']} saved submissions, {stats['flagged_share']:.0%} were flagged "
+                   f"as likely to benefit from treatment (average likelihood {stats['mean_probability']:.0%}).")
+
+observe("page_render_seconds", time.perf_counter() - page_started, page="prediction")
+write_metrics_file()
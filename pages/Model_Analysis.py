@@ -1,10 +1,7 @@
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import plotly.express as px
 from pathlib import Path
-from utils import load_model,load_data
+from model_card import get_model_card
 import altair as alt
 st.set_page_config(
     page_title="Model Analysis Dashboard",
@@ -32,18 +29,20 @@ st.subheader(" Feature Importance Analysis",divider="red")
 
 model_path = "models/Mental_Health_Prediction_model2.cbm"
 
-model = load_model(model_path)
+# Importances and held-out metrics are computed once per model version by model_card.py
+try:
+    card = get_model_card(model_path)
+except (FileNotFoundError, ValueError) as e:
+    st.error(f"Model card unavailable: {e}. Rebuild it with `python model_card.py --data \"Data/Mental Health Dataset.csv\"`.")
+    st.stop()
 
-X_train = load_data("Data/X_train2.csv")
-
-feature_names = model.feature_names_
-importances = model.get_feature_importance()
+importance_types = list(card["feature_importance"])
+importance_type = st.radio("Importance type", importance_types, horizontal=True)
 
 # Create DataFrame of feature importances
-feat_df = pd.DataFrame({
-    "Feature": feature_names,
-    "Importance": importances
-}).sort_values(by="Importance", ascending=False).reset_index(drop=True)
+feat_df = pd.DataFrame(
+    list(card["feature_importance"][importance_type].items()), columns=["Feature", "Importance"]
+).sort_values(by="Importance", ascending=False).reset_index(drop=True)
 
 # Take top 20 for visualization
 feat_df_top20 = feat_df.head(20)
@@ -57,7 +56,7 @@ chart = alt.Chart(feat_df_top20).mark_bar(color='steelblue').encode(
 ).properties(
     width=700,
     height=600,
-    title=' Top 8 Feature Importances (CatBoost)'
+    title=f' Top {len(feat_df_top20)} Feature Importances (CatBoost {importance_type})'
 )
 
 # Display in Streamlit
@@ -85,53 +84,94 @@ The following features were excluded due to low predictive importance and weak a
 """)
 
 st.subheader("Performance Metrics Observed During Model Training",divider="red")
-col1 , col2 = st.columns(2)
-
-df = pd.DataFrame({
-    'Metric': ['Precision', 'Recall', 'F1-Score'] * 2,
-    'Score': [0.79, 0.65, 0.72, 0.71, 0.83, 0.77],
-    'Class': ['No'] * 3 + ['Yes'] * 3
-})
-
-df_avg = pd.DataFrame({
-    'Metric': ['Precision', 'Recall', 'F1-Score'] * 2,
-    'Score': [0.75, 0.74, 0.74, 0.75, 0.74, 0.74],
-    'Type': ['Macro Avg'] * 3 + ['Weighted Avg'] * 3
-})
-
-
-with col1:
-    
-    chart = alt.Chart(df).mark_bar().encode(
-        x=alt.X('Metric:N', title=None),
-        y=alt.Y('Score:Q', title='Score'),
-        color='Class:N',
-        column=alt.Column('Class:N', title=''),
-        tooltip=['Metric', 'Score', 'Class']
-    ).properties(width=150, height=300)
-
-    st.altair_chart(chart)
-
-with col2:
-    avg_chart = alt.Chart(df_avg).mark_bar().encode(
-        x=alt.X('Metric:N', title=None),
-        y=alt.Y('Score:Q', title='Score', scale=alt.Scale(domain=[0, 1])),
-        color=alt.Color('Type:N', scale=alt.Scale(scheme='set2')),
-        column=alt.Column('Type:N', title=''),
-        tooltip=['Metric', 'Score', 'Type']
-    ).properties(width=150, height=300)
-
-    st.altair_chart(avg_chart)
-
 
-st.markdown("""###  Model Evaluation Summary
+evaluation = card.get("evaluation")
+# Until held-out metrics are computed for this model version, show the figures recorded at training time
+reported = card.get("reported_evaluation") if evaluation is None else None
+if evaluation is None and reported is None:
+    st.info("Held-out metrics have not been computed for this model version yet. Build them with "
+            "`python model_card.py --data \"Data/Mental Health Dataset.csv\"`.")
+else:
+    if reported is not None:
+        st.warning(f"These figures were {reported['source']}; they have not been recomputed for this model card. "
+                   "The confusion matrix and ROC/PR curves appear once the card is rebuilt with "
+                   "`python model_card.py --data \"Data/Mental Health Dataset.csv\"`.")
+    report = (evaluation or reported)["classification_report"]
+    metric_keys = {'Precision': 'precision', 'Recall': 'recall', 'F1-Score': 'f1-score'}
+    col1 , col2 = st.columns(2)
+
+    df = pd.DataFrame([
+        {'Metric': metric, 'Score': round(report[label][key], 2), 'Class': name}
+        for label, name in [('0', 'No'), ('1', 'Yes')]
+        for metric, key in metric_keys.items()
+    ])
+
+    df_avg = pd.DataFrame([
+        {'Metric': metric, 'Score': round(report[label][key], 2), 'Type': name}
+        for label, name in [('macro avg', 'Macro Avg'), ('weighted avg', 'Weighted Avg')]
+        for metric, key in metric_keys.items()
+    ])
+
+    with col1:
+
+        chart = alt.Chart(df).mark_bar().encode(
+            x=alt.X('Metric:N', title=None),
+            y=alt.Y('Score:Q', title='Score'),
+            color='Class:N',
+            column=alt.Column('Class:N', title=''),
+            tooltip=['Metric', 'Score', 'Class']
+        ).properties(width=150, height=300)
+
+        st.altair_chart(chart)
+
+    with col2:
+        avg_chart = alt.Chart(df_avg).mark_bar().encode(
+            x=alt.X('Metric:N', title=None),
+            y=alt.Y('Score:Q', title='Score', scale=alt.Scale(domain=[0, 1])),
+            color=alt.Color('Type:N', scale=alt.Scale(scheme='set2')),
+            column=alt.Column('Type:N', title=''),
+            tooltip=['Metric', 'Score', 'Type']
+        ).properties(width=150, height=300)
+
+        st.altair_chart(avg_chart)
+
+    if evaluation is not None:
+        col3 , col4 , col5 = st.columns(3)
+
+        with col3:
+            st.markdown("<h5>Confusion Matrix</h5>",unsafe_allow_html=True)
+            st.dataframe(pd.DataFrame(
+                evaluation["confusion_matrix"],
+                index=['Actual: No', 'Actual: Yes'],
+                columns=['Predicted: No', 'Predicted: Yes']
+            ))
+            st.caption(f"{evaluation['n_test_rows']} held-out rows, threshold {evaluation['threshold']}")
+
+        with col4:
+            roc = evaluation["roc_curve"]
+            roc_chart = alt.Chart(pd.DataFrame({'False Positive Rate': roc['fpr'], 'True Positive Rate': roc['tpr']})).mark_line().encode(
+                x='False Positive Rate:Q',
+                y='True Positive Rate:Q'
+            ).properties(height=300, title=f"ROC Curve (AUC {roc['auc']:.3f})")
+            st.altair_chart(roc_chart, use_container_width=True)
+
+        with col5:
+            pr = evaluation["pr_curve"]
+            pr_chart = alt.Chart(pd.DataFrame({'Recall': pr['recall'], 'Precision': pr['precision']})).mark_line().encode(
+                x='Recall:Q',
+                y=alt.Y('Precision:Q', scale=alt.Scale(domain=[0, 1]))
+            ).properties(height=300, title=f"Precision-Recall Curve (AP {pr['average_precision']:.3f})")
+            st.altair_chart(pr_chart, use_container_width=True)
+
+
+    st.markdown(f"""###  Model Evaluation Summary
 
 The model demonstrates balanced performance across both classes with high scores in key metrics:
 
-- **Class 1 (Needs Treatment)** shows a higher **recall (0.83)**, indicating the model is effective at correctly identifying individuals likely to need mental health support—crucial in a healthcare context where missing such cases can have serious consequences.
-- **Class 0 (No Treatment Needed)** has a higher **precision (0.79)**, meaning fewer false positives for those predicted as not needing treatment.
+- **Class 1 (Needs Treatment)** shows a higher **recall ({report['1']['recall']:.2f})**, indicating the model is effective at correctly identifying individuals likely to need mental health support—crucial in a healthcare context where missing such cases can have serious consequences.
+- **Class 0 (No Treatment Needed)** has a higher **precision ({report['0']['precision']:.2f})**, meaning fewer false positives for those predicted as not needing treatment.
 
-The **Macro and Weighted Average metrics** (Precision ~0.75, Recall ~0.74, F1 ~0.74) are closely aligned, suggesting:
+The **Macro and Weighted Average metrics** (Precision ~{report['macro avg']['precision']:.2f}, Recall ~{report['macro avg']['recall']:.2f}, F1 ~{report['macro avg']['f1-score']:.2f}) are closely aligned, suggesting:
 
 - The model performs **consistently well across both classes**.
 - The dataset is **fairly balanced**, and the model is **not biased toward any particular class**.
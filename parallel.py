@@ -0,0 +1,78 @@
+"""
+Multi-core execution for batch scoring and association statistics.
+
+Scoring is sharded by row range and statistics by feature; shard results are
+stitched back together in order, so the output is identical to the serial path.
+"""
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from association_stats import category_codes, contingency_table, summary_from_tables, cat_cols
+from utils import DEFAULT_MODEL_PATH, get_model
+
+MIN_ROWS_PER_SHARD = 10_000
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def make_executor(workers: int = None, kind: str = "process") -> Executor:
+    """kind is 'process' (separate interpreters, one model copy each) or 'thread'."""
+    workers = workers or default_workers()
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor kind: {kind}")
+
+
+def row_shards(n_rows: int, n_shards: int) -> list:
+    """Splits range(n_rows) into n_shards contiguous (start, stop) ranges of near-equal size."""
+    n_shards = max(1, min(n_shards, n_rows))
+    bounds = np.linspace(0, n_rows, n_shards + 1).astype(int)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _predict_shard(model_path: Path, rows) -> np.ndarray:
+    # Each shard already runs on its own core, so CatBoost itself stays single-threaded
+    return get_model(model_path).predict_proba(rows, thread_count=1)[:, 1]
+
+
+def predict_proba_parallel(X, model_path: Path = DEFAULT_MODEL_PATH, workers: int = None,
+                           executor: Executor = None, min_rows_per_shard: int = MIN_ROWS_PER_SHARD) -> np.ndarray:
+    """
+    Class 1 probabilities for every row of X (DataFrame or array in model feature order).
+    Pass a long-lived executor to reuse worker processes and their loaded models across calls.
+    """
+    workers = workers or getattr(executor, "_max_workers", None) or default_workers()
+    shards = row_shards(len(X), min(workers, -(-len(X) // min_rows_per_shard)))
+    if len(shards) == 1:
+        return get_model(model_path).predict_proba(X)[:, 1]
+
+    take = X.iloc.__getitem__ if isinstance(X, pd.DataFrame) else X.__getitem__
+    own_executor = executor is None
+    executor = executor or make_executor(workers)
+    try:
+        futures = [executor.submit(_predict_shard, model_path, take(slice(start, stop))) for start, stop in shards]
+        return np.concatenate([future.result() for future in futures])
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def _feature_table(feature: pd.Series, y_codes: np.ndarray, ny: int) -> np.ndarray:
+    return contingency_table(*category_codes(feature), y_codes, ny)
+
+
+def association_summary_parallel(df: pd.DataFrame, target: str = "treatment", features: list = None,
+                                 workers: int = None, kind: str = "thread") -> pd.DataFrame:
+    """association_stats.association_summary with one contingency table per worker task."""
+    features = features or cat_cols
+    y_codes, ny = category_codes(df[target])
+    with make_executor(workers, kind) as executor:
+        futures = {feature: executor.submit(_feature_table, df[feature], y_codes, ny) for feature in features}
+        tables = {feature: future.result() for feature, future in futures.items()}
+    return summary_from_tables(tables)
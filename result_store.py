@@ -0,0 +1,138 @@
+"""
+Append-only store of quiz results: (timestamp, session, answer code, probability).
+
+Records are fixed-size NumPy structured rows (22 bytes each) kept in a growable
+in-memory buffer and appended to a flat binary file, so a restart reloads the
+history with one np.fromfile call. Submission totals and per-answer-code counts
+are maintained incrementally, so stats() costs the same however many records
+exist, and nothing here ever calls a model.
+
+The file location comes from RESULT_STORE_PATH (default: Data/quiz_results.bin).
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+import numpy as np
+from lookup_table import decode_answers, n_combinations
+
+RESULT_STORE_PATH = Path(os.environ.get("RESULT_STORE_PATH", Path(__file__).parent / "Data" / "quiz_results.bin"))
+THRESHOLD = 0.5
+INITIAL_CAPACITY = 1024
+
+record_dtype = np.dtype([
+    ("timestamp", "<f8"),
+    ("session", "<u8"),
+    ("answer_code", "<u2"),
+    ("probability", "<f4"),
+])
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def session_key(session_id: str) -> int:
+    """64-bit key for a session identifier, so records stay fixed-size."""
+    return int.from_bytes(hashlib.blake2b(session_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ResultStore:
+    def __init__(self, path: Path = RESULT_STORE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        records = self._read()
+        self._buffer = np.empty(max(INITIAL_CAPACITY, 2 * len(records)), dtype=record_dtype)
+        self._buffer[:len(records)] = records
+        self._size = len(records)
+        self._code_counts = np.bincount(records["answer_code"], minlength=n_combinations).astype(np.int64)
+        self._flagged = int(np.count_nonzero(records["probability"] >= THRESHOLD))
+        self._probability_sum = float(records["probability"].sum(dtype=np.float64))
+
+    def _read(self) -> np.ndarray:
+        if not self.path.exists():
+            return np.empty(0, dtype=record_dtype)
+        records = np.fromfile(self.path, dtype=np.uint8)
+        n_records = len(records) // record_dtype.itemsize
+        if len(records) % record_dtype.itemsize:
+            # Drop a trailing partial record left by an interrupted write so appends stay aligned
+            os.truncate(self.path, n_records * record_dtype.itemsize)
+        return records[:n_records * record_dtype.itemsize].view(record_dtype)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def records(self) -> np.ndarray:
+        """Read-only view of every record, oldest first."""
+        view = self._buffer[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def append(self, session_id: str, answer_code: int, probability: float, timestamp: float = None):
+        record = np.array([(timestamp or time.time(), session_key(session_id), answer_code, probability)],
+                          dtype=record_dtype)
+        with self._lock:
+            if self._size == len(self._buffer):
+                grown = np.empty(2 * len(self._buffer), dtype=record_dtype)
+                grown[:self._size] = self._buffer[:self._size]
+                self._buffer = grown
+            self._buffer[self._size] = record[0]
+            self._size += 1
+            self._code_counts[answer_code] += 1
+            self._flagged += int(probability >= THRESHOLD)
+            self._probability_sum += float(record["probability"][0])
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(record.tobytes())
+
+    def history(self, session_id: str, limit: int = None) -> list:
+        """A session's submissions, newest first, with their answers decoded."""
+        records = self.records
+        matches = records[records["session"] == np.uint64(session_key(session_id))][::-1][:limit]
+        return [
+            {
+                "timestamp": float(record["timestamp"]),
+                "probability": float(record["probability"]),
+                "answers": decode_answers(int(record["answer_code"])),
+            }
+            for record in matches
+        ]
+
+    def session_stats(self, session_id: str) -> dict:
+        """Submission count, flagged share and mean probability over one session's own submissions."""
+        records = self.records
+        probabilities = records["probability"][records["session"] == np.uint64(session_key(session_id))]
+        n_records = len(probabilities)
+        return {
+            "submissions": n_records,
+            "flagged_share": float(np.count_nonzero(probabilities >= THRESHOLD)) / n_records if n_records else 0.0,
+            "mean_probability": float(probabilities.mean(dtype=np.float64)) if n_records else 0.0,
+        }
+
+    def stats(self, top: int = 5) -> dict:
+        """Totals across every session, from the incrementally maintained counters (for operators, not visitors)."""
+        with self._lock:
+            n_records = self._size
+            code_counts = self._code_counts.copy()
+            flagged, probability_sum = self._flagged, self._probability_sum
+        top_codes = np.argsort(code_counts)[::-1][:top]
+        return {
+            "submissions": n_records,
+            "flagged_share": flagged / n_records if n_records else 0.0,
+            "mean_probability": probability_sum / n_records if n_records else 0.0,
+            "distinct_answer_sets": int(np.count_nonzero(code_counts)),
+            "most_common": [
+                {"answers": decode_answers(int(code)), "count": int(code_counts[code])}
+                for code in top_codes if code_counts[code]
+            ],
+        }
+
+
+def get_result_store(path: Path = RESULT_STORE_PATH) -> ResultStore:
+    """Returns the process-wide store for path, loading it on first use."""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ResultStore(path)
+        return _stores[key]
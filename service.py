@@ -0,0 +1,128 @@
+"""
+Lightweight HTTP inference service for the mental health model.
+
+Run with:
+    uvicorn service:app --host 0.0.0.0 --port 8000
+
+Endpoints:
+    POST /predict   one answer object, or {"instances": [answer objects]}
+    GET  /healthz   liveness
+    GET  /readyz    readiness (model loaded)
+    GET  /metrics   Prometheus metrics (see metrics.py)
+"""
+import contextlib
+import os
+import time
+from pathlib import Path
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from metrics import increment, log_request, observe, render_prometheus
+from utils import DEFAULT_MODEL_PATH, feature_order, quiz_options
+from lookup_table import encode_answers, get_table
+from model_router import get_router
+
+MODEL_PATH = Path(os.environ.get("MODEL_PATH", DEFAULT_MODEL_PATH))
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 10_000))
+THRESHOLD = 0.5
+
+
+class InvalidInput(ValueError):
+    pass
+
+
+def validate_answers(answers) -> int:
+    """
+    Checks one answer object against the quiz schema.
+    Returns its index in the prediction lookup table.
+    """
+    if not isinstance(answers, dict):
+        raise InvalidInput("Each instance must be a JSON object")
+    for feature in feature_order:
+        value = answers.get(feature)
+        if value not in quiz_options[feature]:
+            raise InvalidInput(f"{feature} must be one of {quiz_options[feature]}, got {value!r}")
+    return encode_answers(answers)
+
+
+def format_prediction(probability: float) -> dict:
+    return {"probability": float(probability), "prediction": int(probability >= THRESHOLD)}
+
+
+def predict_indices(indices: list) -> list:
+    probabilities = get_table(MODEL_PATH)[indices]
+    return [format_prediction(p) for p in probabilities]
+
+
+async def predict(request: Request) -> JSONResponse:
+    started = time.perf_counter()
+    response = await _predict(request)
+    latency = time.perf_counter() - started
+    observe("request_latency_seconds", latency, endpoint="/predict")
+    increment("requests_total", endpoint="/predict", status=response.status_code)
+    log_request(endpoint="/predict", status=response.status_code, latency_ms=round(latency * 1e3, 3))
+    return response
+
+
+async def _predict(request: Request) -> JSONResponse:
+    try:
+        payload = await request.json()
+    except ValueError:
+        return JSONResponse({"error": "Request body must be JSON"}, status_code=400)
+
+    batched = isinstance(payload, dict) and "instances" in payload
+    instances = payload["instances"] if batched else [payload]
+    if not isinstance(instances, list) or not instances:
+        return JSONResponse({"error": "'instances' must be a non-empty list"}, status_code=400)
+    if len(instances) > MAX_BATCH_SIZE:
+        return JSONResponse({"error": f"At most {MAX_BATCH_SIZE} instances per request"}, status_code=413)
+
+    try:
+        indices = [validate_answers(answers) for answers in instances]
+    except InvalidInput as e:
+        return JSONResponse({"error": str(e)}, status_code=422)
+
+    router = get_router(MODEL_PATH)
+    if router.enabled:
+        # A/B or shadow routing is on: each instance is routed on its own, live ones are micro-batched
+        results = [{**format_prediction(routed["probability"]), "model": routed["model"]}
+                   for routed in await router.predict_many(instances)]
+    else:
+        results = predict_indices(indices)
+    increment("predictions_total", len(results), source="service")
+    return JSONResponse({"predictions": results} if batched else results[0])
+
+
+async def healthz(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+async def readyz(request: Request) -> JSONResponse:
+    try:
+        get_table(MODEL_PATH)
+    except Exception as e:
+        return JSONResponse({"status": "unavailable", "error": str(e)}, status_code=503)
+    return JSONResponse({"status": "ready", "model": MODEL_PATH.name})
+
+
+async def metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Load the prediction table before accepting traffic so the first request is not a cold start
+    get_table(MODEL_PATH)
+    yield
+
+
+app = Starlette(
+    routes=[
+        Route("/predict", predict, methods=["POST"]),
+        Route("/healthz", healthz),
+        Route("/readyz", readyz),
+        Route("/metrics", metrics),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,139 @@
+"""
+Headless training pipeline for the mental health prediction model.
+
+Reproduces the notebook's cleaning, feature engineering, split and CatBoost fit
+from a local CSV, and writes the model, the training split, metrics, the model's
+JSON export (model_export.py) and its model card (model_card.py).
+
+Usage:
+    python train.py --data "Data/Mental Health Dataset.csv" [--thread-count 16] [--params models/tuned_params.json]
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+import pandas as pd
+from catboost import CatBoostClassifier
+from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import train_test_split
+from ingest import RAW_DATA_ENCODING, read_survey_chunks
+from lookup_table import quiz_space
+from model_card import build_model_card
+from model_export import export_model, verify_export
+from utils import feature_order
+
+RAW_DATA_PATH = Path("Data/Mental Health Dataset.csv")
+
+# Features dropped for model2 because of their weak association with treatment
+dropped_features = ['Changes_Habits', 'Social_Weakness', 'Work_Interest', 'Mood_Swings',
+                    'Growing_Stress', 'Coping_Struggles', 'Days_Indoors']
+
+model_params = dict(
+    iterations=1000,
+    depth=6,
+    learning_rate=0.05,
+    loss_function='Logloss',
+    eval_metric='F1',
+    class_weights=[1, 2],  # Increase weight for class 1 (treatment)
+    random_seed=42,
+)
+early_stopping_rounds = 50
+test_size = 0.2
+split_seed = 42
+
+
+def load_training_data(data_path: Path) -> pd.DataFrame:
+    """Reads a raw survey export, or an already cleaned dataset, as a cleaned frame."""
+    header = pd.read_csv(data_path, encoding=RAW_DATA_ENCODING, nrows=0)
+    if 'Continent' in header.columns:
+        return pd.read_csv(data_path, encoding=RAW_DATA_ENCODING)
+    return pd.concat(read_survey_chunks(data_path), ignore_index=True)
+
+
+def split_features(df: pd.DataFrame) -> tuple:
+    X = df.drop(columns=['treatment', *dropped_features])[feature_order]
+    y = df['treatment'].map({'Yes': 1, 'No': 0}).astype(int)
+    return train_test_split(X, y, stratify=y, test_size=test_size, random_state=split_seed)
+
+
+def train_model(X_train, y_train, X_test, y_test, thread_count: int = -1, verbose: int = 100,
+                params: dict = None) -> CatBoostClassifier:
+    """params overrides entries of model_params (e.g. the output of tune.py)."""
+    model = CatBoostClassifier(
+        **{**model_params, **(params or {})},
+        cat_features=X_train.columns.tolist(),
+        thread_count=thread_count,
+        verbose=verbose,
+        allow_writing_files=False,
+    )
+    model.fit(X_train, y_train, eval_set=(X_test, y_test), early_stopping_rounds=early_stopping_rounds)
+    return model
+
+
+def evaluate(model: CatBoostClassifier, X_test, y_test) -> dict:
+    y_pred = model.predict(X_test)
+    return {
+        "classification_report": classification_report(y_test, y_pred, output_dict=True, zero_division=0),
+        "confusion_matrix": confusion_matrix(y_test, y_pred).tolist(),
+        "best_iteration": model.get_best_iteration(),
+        "tree_count": model.tree_count_,
+    }
+
+
+def run(data_path: Path = RAW_DATA_PATH, model_path: Path = Path("models/Mental_Health_Prediction_model2.cbm"),
+        data_dir: Path = Path("Data"), thread_count: int = -1, verbose: int = 100, params: dict = None) -> dict:
+    """Runs the full pipeline and returns the metrics written next to the model."""
+    timings = {}
+    started = time.perf_counter()
+    df = load_training_data(data_path)
+    timings["load_and_clean_seconds"] = time.perf_counter() - started
+
+    X_train, X_test, y_train, y_test = split_features(df)
+
+    started = time.perf_counter()
+    model = train_model(X_train, y_train, X_test, y_test, thread_count, verbose, params)
+    timings["fit_seconds"] = time.perf_counter() - started
+
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    model.save_model(str(model_path))
+    # The NumPy evaluator must agree with CatBoost on held-out survey rows as well as the quiz space
+    export_model(model_path)
+    verify_export(model_path, rows=X_test.values.tolist() + quiz_space())
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    X_train.to_csv(data_dir / "X_train2.csv", index=False)
+    y_train.to_csv(data_dir / "y_train2.csv", index=False)
+
+    metrics = {
+        **evaluate(model, X_test, y_test),
+        "n_rows": len(df),
+        "thread_count": thread_count,
+        "params": {**model_params, **(params or {})},
+        "timings": timings,
+    }
+    model_path.with_suffix(".metrics.json").write_text(json.dumps(metrics, indent=2))
+    build_model_card(model_path, X_test, y_test)
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the mental health prediction model.")
+    parser.add_argument("--data", type=Path, default=RAW_DATA_PATH, help="Raw survey export or cleaned dataset CSV")
+    parser.add_argument("--model", type=Path, default=Path("models/Mental_Health_Prediction_model2.cbm"),
+                        help="Where to write the trained .cbm")
+    parser.add_argument("--data-dir", type=Path, default=Path("Data"), help="Where to write X_train2.csv/y_train2.csv")
+    parser.add_argument("--thread-count", type=int, default=-1, help="CatBoost threads (-1 uses every core)")
+    parser.add_argument("--verbose", type=int, default=100, help="CatBoost logging period (0 disables)")
+    parser.add_argument("--params", type=Path, help="JSON object of CatBoost parameters overriding model_params")
+    args = parser.parse_args(argv)
+
+    params = json.loads(args.params.read_text()) if args.params else None
+    metrics = run(args.data, args.model, args.data_dir, args.thread_count, args.verbose, params)
+    report = metrics["classification_report"]
+    print(f"Saved {args.model} ({metrics['tree_count']} trees) in {metrics['timings']['fit_seconds']:.1f}s fit")
+    print(f"Recall (treatment): {report['1']['recall']:.3f}  Macro F1: {report['macro avg']['f1-score']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Hyperparameter search for the mental health model.
+
+Random search over depth, learning rate, l2_leaf_reg, one_hot_max_size and the
+treatment class weight. Trials run in parallel worker processes (one CatBoost
+thread each) and are cut short by CatBoost's early stopping on a validation
+split carved out of train.py's training split, so the held-out test set stays
+untouched. Each trial records F1/recall for the treatment class, fit time and
+per-row inference latency; the Pareto front over those objectives is reported
+and the most accurate trial within the latency budget is saved for train.py.
+
+Usage:
+    python tune.py --data "Data/Mental Health Dataset.csv" [--trials 40] [--workers 0]
+    python train.py --data "Data/Mental Health Dataset.csv" --params models/tuned_params.json
+"""
+import argparse
+import json
+import math
+import random
+import statistics
+import time
+from pathlib import Path
+from sklearn.metrics import f1_score, recall_score
+from sklearn.model_selection import train_test_split
+from parallel import default_workers, make_executor
+from train import RAW_DATA_PATH, load_training_data, split_features, train_model
+
+# Each entry samples one parameter value from a random.Random
+search_space = {
+    "depth": lambda rng: rng.randint(3, 8),
+    "learning_rate": lambda rng: round(math.exp(rng.uniform(math.log(0.01), math.log(0.3))), 4),
+    "l2_leaf_reg": lambda rng: round(math.exp(rng.uniform(math.log(1), math.log(10))), 3),
+    "one_hot_max_size": lambda rng: rng.choice([2, 4, 10, 255]),
+    "class_weights": lambda rng: [1, rng.choice([1, 1.5, 2, 2.5, 3])],
+}
+objectives = {
+    "f1": "max",
+    "recall": "max",
+    "fit_seconds": "min",
+    "latency_ms_single_row": "min",
+}
+validation_size = 0.2
+LATENCY_REPEAT = 200
+
+
+def sample_params(rng: random.Random) -> dict:
+    return {name: sample(rng) for name, sample in search_space.items()}
+
+
+def single_row_latency(model, row) -> float:
+    """Median predict_proba wall time (seconds) for one row."""
+    model.predict_proba(row)
+    times = []
+    for _ in range(LATENCY_REPEAT):
+        started = time.perf_counter()
+        model.predict_proba(row)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def run_trial(params: dict, X_train, y_train, X_valid, y_valid) -> dict:
+    """Fits one configuration with early stopping and measures its quality and cost."""
+    started = time.perf_counter()
+    model = train_model(X_train, y_train, X_valid, y_valid, thread_count=1, verbose=0, params=params)
+    fit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    y_pred = (model.predict_proba(X_valid)[:, 1] >= 0.5).astype(int)
+    batch_seconds = time.perf_counter() - started
+    return {
+        "params": params,
+        "f1": f1_score(y_valid, y_pred, zero_division=0),
+        "recall": recall_score(y_valid, y_pred, zero_division=0),
+        "tree_count": model.tree_count_,
+        "fit_seconds": fit_seconds,
+        "latency_ms_single_row": single_row_latency(model, X_valid.iloc[:1]) * 1e3,
+        "latency_us_per_row_batch": batch_seconds / len(X_valid) * 1e6,
+    }
+
+
+def dominates(a: dict, b: dict) -> bool:
+    """True if trial a is at least as good as b on every objective and better on one."""
+    better = [a[name] > b[name] if goal == "max" else a[name] < b[name] for name, goal in objectives.items()]
+    no_worse = [a[name] >= b[name] if goal == "max" else a[name] <= b[name] for name, goal in objectives.items()]
+    return all(no_worse) and any(better)
+
+
+def pareto_front(trials: list) -> list:
+    return [i for i, trial in enumerate(trials) if not any(dominates(other, trial) for other in trials)]
+
+
+def select_best(trials: list, max_latency_ms: float = None) -> dict:
+    """Highest-F1 trial within the single-row latency budget, cheaper fits breaking ties."""
+    eligible = [trial for trial in trials if max_latency_ms is None or trial["latency_ms_single_row"] <= max_latency_ms]
+    if not eligible:
+        raise ValueError(f"No trial has a single-row latency within {max_latency_ms} ms")
+    return max(eligible, key=lambda trial: (round(trial["f1"], 4), -trial["latency_ms_single_row"], -trial["fit_seconds"]))
+
+
+def tune(data_path: Path, n_trials: int = 40, workers: int = None, seed: int = 42) -> list:
+    X_train, _, y_train, _ = split_features(load_training_data(data_path))
+    X_fit, X_valid, y_fit, y_valid = train_test_split(X_train, y_train, stratify=y_train,
+                                                      test_size=validation_size, random_state=seed)
+    rng = random.Random(seed)
+    candidates = [sample_params(rng) for _ in range(n_trials)]
+    with make_executor(workers) as executor:
+        futures = [executor.submit(run_trial, params, X_fit, y_fit, X_valid, y_valid) for params in candidates]
+        trials = []
+        for i, future in enumerate(futures, 1):
+            trials.append(future.result())
+            print(f"[{i}/{n_trials}] f1={trials[-1]['f1']:.4f} recall={trials[-1]['recall']:.4f} "
+                  f"fit={trials[-1]['fit_seconds']:.1f}s latency={trials[-1]['latency_ms_single_row']:.3f}ms "
+                  f"{trials[-1]['params']}")
+    return trials
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search CatBoost hyperparameters for the mental health model.")
+    parser.add_argument("--data", type=Path, default=RAW_DATA_PATH, help="Raw survey export or cleaned dataset CSV")
+    parser.add_argument("--trials", type=int, default=40, help="Number of sampled configurations")
+    parser.add_argument("--workers", type=int, default=0, help="Parallel trials (0 uses every core)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-latency-ms", type=float, help="Single-row latency budget for the selected trial")
+    parser.add_argument("--output", type=Path, default=Path("models/tuning.json"), help="Every trial and the Pareto front")
+    parser.add_argument("--params-output", type=Path, default=Path("models/tuned_params.json"),
+                        help="Selected parameters, for train.py --params")
+    args = parser.parse_args(argv)
+
+    trials = tune(args.data, args.trials, args.workers or default_workers(), args.seed)
+    front = pareto_front(trials)
+    best = select_best(trials, args.max_latency_ms)
+    args.output.write_text(json.dumps({"objectives": objectives, "trials": trials, "pareto_front": front}, indent=2))
+    args.params_output.write_text(json.dumps(best["params"], indent=2))
+
+    print(f"\nPareto front ({len(front)} of {len(trials)} trials):")
+    for i in sorted(front, key=lambda i: -trials[i]["f1"]):
+        trial = trials[i]
+        print(f"  #{i:<3} f1={trial['f1']:.4f} recall={trial['recall']:.4f} fit={trial['fit_seconds']:.1f}s "
+              f"latency={trial['latency_ms_single_row']:.3f}ms trees={trial['tree_count']}")
+    print(f"Selected f1={best['f1']:.4f} recall={best['recall']:.4f} {best['params']} -> {args.params_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,277 @@
+import os
+import re
+import threading
+from typing import TYPE_CHECKING
+import numpy as np
 import pandas as pd
-from catboost import CatBoostClassifier
 from pathlib import Path
-import streamlit as st 
+from metrics import increment, timed
 
-def load_model(model_path:Path) -> CatBoostClassifier:
-    model = CatBoostClassifier()
-    model.load_model(str(model_path))
+# catboost and streamlit are imported where they are used, so pages and tools
+# that only need the constants or cached artifacts do not pay for them at startup
+if TYPE_CHECKING:
+    from catboost import CatBoostClassifier, Pool
+
+DEFAULT_MODEL_PATH = Path(__file__).parent / "models" / "Mental_Health_Prediction_model2.cbm"
+
+# Input features expected by the deployed model, in order
+feature_order = [
+    'Gender',
+    'self_employed',
+    'family_history',
+    'Mental_Health_History',
+    'mental_health_interview',
+    'care_options',
+    'Continent',
+    'Occupation_Category'
+]
+
+# Answer options offered by the prediction quiz
+gender_options = ["Male", "Female", "Other"]
+yes_no = ["Yes", "No"]
+continent_options = ["Asia", "Europe", "North America", "South America", "Africa", "Oceania", "Antarctica"]
+occupation_options = ["Professional","Non-professional"]
+
+quiz_options = {
+    'Gender': gender_options,
+    'self_employed': yes_no,
+    'family_history': yes_no,
+    'Mental_Health_History': yes_no,
+    'mental_health_interview': yes_no,
+    'care_options': yes_no,
+    'Continent': continent_options,
+    'Occupation_Category': occupation_options
+}
+
+# Answers used for features the quiz does not ask when scoring with the full-feature
+# model (models/Mental_Health_Prediction_model.cbm); all of them carry ~0 importance there
+unasked_feature_defaults = {
+    'Days_Indoors': '1-14 days',
+    'Growing_Stress': 'Maybe',
+    'Changes_Habits': 'Maybe',
+    'Mood_Swings': 'Medium',
+    'Coping_Struggles': 'No',
+    'Work_Interest': 'Maybe',
+    'Social_Weakness': 'Maybe',
+}
+occupation_for_category = {"Professional": "Corporate", "Non-professional": "Others"}
+
+# Process-wide registries: (resolved path) -> (file signature, object).
+# Streamlit re-executes page scripts on every rerun but imports utils only once,
+# so every session shares the instances held here.
+_model_registry = {}
+_dataset_registry = {}
+_encoder_registry = {}
+# Guards _resource_locks; each (registry, path) gets its own lock so a slow load blocks only its own key
+_registry_lock = threading.Lock()
+_resource_locks = {}
+
+def load_model(model_path:Path) -> "CatBoostClassifier":
+    from catboost import CatBoostClassifier
+    with timed("model_load_seconds"):
+        model = CatBoostClassifier()
+        model.load_model(str(model_path))
     return model
 
+def file_signature(path: Path) -> tuple:
+    stat = Path(path).stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+def temporary_path(path: Path) -> Path:
+    """Sibling of path unique to this process and thread; write it, then replace() path with it."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+def savez_atomic(path: Path, **arrays):
+    """np.savez to path without readers in other processes ever seeing a partly written file."""
+    tmp_path = temporary_path(path)
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    tmp_path.replace(path)
+
+def shared_resource(registry: dict, path: Path, loader, name: str = "resource"):
+    """
+    Returns registry's object for path, calling loader(path) on first use and
+    again whenever the file's signature changes. Hits and misses are counted
+    under cache_requests_total{cache=name}.
+    """
+    key = str(Path(path).resolve())
+    signature = file_signature(key)
+    entry = registry.get(key)
+    if entry is not None and entry[0] == signature:
+        increment("cache_requests_total", cache=name, result="hit")
+        return entry[1]
+    with _registry_lock:
+        lock = _resource_locks.setdefault((id(registry), key), threading.RLock())
+    with lock:
+        entry = registry.get(key)
+        if entry is None or entry[0] != signature:
+            increment("cache_requests_total", cache=name, result="miss")
+            entry = (signature, loader(Path(key)))
+            registry[key] = entry
+        else:
+            increment("cache_requests_total", cache=name, result="hit")
+    return entry[1]
+
+def get_model(model_path: Path) -> "CatBoostClassifier":
+    """
+    Returns the shared CatBoost instance for model_path, loading it on first use.
+    The model is reloaded when the file's mtime or size changes, so a new .cbm can
+    be dropped in without restarting the server.
+    """
+    return shared_resource(_model_registry, model_path, load_model, "model")
+
 def load_data(data_path: Path) -> pd.DataFrame:
     return pd.read_csv(data_path)
 
-def preprocess_input(user_answers: dict, feature_order: list) -> pd.DataFrame:
+def columnar_cache_path(data_path: Path) -> Path:
+    data_path = Path(data_path)
+    mtime_ns, size = file_signature(data_path)
+    return data_path.parent / ".cache" / f"{data_path.stem}-{mtime_ns}-{size}.parquet"
+
+def load_columnar(data_path: Path) -> pd.DataFrame:
+    """
+    Reads data_path through its Parquet cache, converting the CSV on first use.
+    Text columns are stored as categoricals. The cache file name embeds the CSV's
+    mtime and size, so editing the CSV invalidates it. Parquet files (e.g. written
+    by ingest.py) are read directly.
+    """
+    if Path(data_path).suffix == ".parquet":
+        return pd.read_parquet(data_path)
+    cache_path = columnar_cache_path(data_path)
+    if cache_path.exists():
+        return pd.read_parquet(cache_path)
+    df = load_data(data_path)
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype("category")
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Only this CSV's caches ({stem}-{mtime}-{size}), not those of other files whose names start with stem
+    stale_name = re.compile(rf"{re.escape(Path(data_path).stem)}-\d+-\d+\.parquet")
+    for stale in cache_path.parent.glob("*.parquet"):
+        if stale != cache_path and stale_name.fullmatch(stale.name):
+            stale.unlink(missing_ok=True)
+    tmp_path = temporary_path(cache_path)
+    df.to_parquet(tmp_path, index=False)
+    tmp_path.replace(cache_path)
+    return df
+
+def get_dataset(data_path: Path) -> pd.DataFrame:
+    """
+    Returns the process-wide shared frame for data_path (see load_columnar).
+    The frame is shared by every session: treat it as read-only and copy before
+    modifying it.
+    """
+    return shared_resource(_dataset_registry, data_path, load_columnar, "dataset")
+
+def filter_frame(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
+    """
+    filters: dict of column -> list of allowed values (an empty list keeps every value)
+    """
+    mask = None
+    for col, values in filters.items():
+        if values:
+            col_mask = df[col].isin(values)
+            mask = col_mask if mask is None else mask & col_mask
+    return df if mask is None else df[mask]
+
+def preview_page(df: pd.DataFrame, page: int, page_size: int, sort_by: str = None, ascending: bool = True,
+                 columns: list = None) -> pd.DataFrame:
+    """
+    Returns: rows of the requested 1-based page, optionally sorted and restricted to columns
+    """
+    start = (page - 1) * page_size
+    if sort_by is None:
+        rows = df.iloc[start:start + page_size]
+    else:
+        values = df[sort_by]
+        # Categories are stored sorted, so their integer codes sort the same way
+        keys = values.cat.codes.to_numpy() if isinstance(values.dtype, pd.CategoricalDtype) else values.to_numpy()
+        order = np.argsort(keys, kind="stable")
+        if not ascending:
+            order = order[::-1]
+        rows = df.iloc[order[start:start + page_size]]
+    return rows[columns] if columns else rows
+
+def model_answers(answers: dict) -> dict:
+    """
+    Completes a quiz answer dict for the full-feature model.
+    Occupation follows from Occupation_Category; other unasked features use unasked_feature_defaults.
+    """
+    answers = {**unasked_feature_defaults, **answers}
+    answers.setdefault('Occupation', occupation_for_category.get(answers.get('Occupation_Category')))
+    return answers
+
+def model_input_rows(answer_rows: list, feature_names: list) -> list:
+    """Expands quiz answer rows (lists in feature_order) to a model's feature_names, as model_answers does."""
+    if list(feature_names) == feature_order:
+        return answer_rows
+    rows = []
+    for row in answer_rows:
+        answers = model_answers(dict(zip(feature_order, row)))
+        rows.append([answers[feature] for feature in feature_names])
+    return rows
+
+def preprocess_input(user_answers: dict, feature_order: list) -> np.ndarray:
     """
     user_answers: dict of feature_name -> selected_option (e.g., {'Gender': 'Male', ...})
     feature_order: list of model's expected input features (ordered)
-    Returns: DataFrame with one row ready for prediction
+    Returns: (1, n_features) object array ready for predict_proba; missing answers are None
+    """
+    with timed("input_encoding_seconds", encoder="preprocess_input"):
+        return np.array([[user_answers.get(feature) for feature in feature_order]], dtype=object)
+
+class AnswerEncoder:
+    """
+    Turns answer dicts into model input without going through pandas.
+    Built once per model from its feature names and categorical feature indices;
+    answers are checked against known_values (feature -> allowed options) up front.
+    """
+    def __init__(self, feature_names: list, cat_feature_indices: list, known_values: dict = None):
+        self.feature_names = list(feature_names)
+        self.cat_feature_indices = list(cat_feature_indices)
+        known_values = known_values or {}
+        self._columns = [
+            (i, feature, frozenset(known_values[feature]) if feature in known_values else None)
+            for i, feature in enumerate(self.feature_names)
+        ]
+
+    @classmethod
+    def from_model(cls, model: "CatBoostClassifier", known_values: dict = None) -> "AnswerEncoder":
+        return cls(model.feature_names_, model.get_cat_feature_indices(), known_values)
+
+    def encode(self, answers) -> np.ndarray:
+        """
+        answers: one answer dict or a list of them
+        Returns: (n_rows, n_features) object array in model feature order
+        """
+        with timed("input_encoding_seconds", encoder="answer_encoder"):
+            return self._encode([answers] if isinstance(answers, dict) else answers)
+
+    def _encode(self, answers: list) -> np.ndarray:
+        encoded = np.empty((len(answers), len(self.feature_names)), dtype=object)
+        for row, user_answers in enumerate(answers):
+            for i, feature, allowed in self._columns:
+                try:
+                    value = user_answers[feature]
+                except KeyError:
+                    raise ValueError(f"Missing answer for {feature}") from None
+                if allowed is not None and value not in allowed:
+                    raise ValueError(f"Unknown value {value!r} for {feature}")
+                encoded[row, i] = value
+        return encoded
+
+    def to_pool(self, answers) -> "Pool":
+        from catboost import Pool
+        return Pool(self.encode(answers), cat_features=self.cat_feature_indices, feature_names=self.feature_names)
+
+def get_encoder(model_path: Path = DEFAULT_MODEL_PATH) -> AnswerEncoder:
+    """
+    Returns the shared encoder for model_path, validating against the quiz options.
+    Pass quiz answers through model_answers first for a model that also takes unasked features.
     """
-    df_input = pd.DataFrame([user_answers])
-    df_input = df_input.reindex(columns=feature_order)
-    return df_input
+    return shared_resource(_encoder_registry, model_path,
+                           lambda path: AnswerEncoder.from_model(get_model(path), quiz_options), "encoder")
 
 
 feature_insights = {
@@ -95,6 +347,7 @@ feature_insights = {
 
 
 def display_feature_insight(feature_name):
+    import streamlit as st
     insight = feature_insights.get(feature_name, "No insight available for this feature.")
     st.markdown("<h5> Interpretation: </h5>",unsafe_allow_html=True)
     for point in insight:
@@ -166,7 +419,35 @@ treatment_feature_insights = {
 }
 
 def display_treatment_feature(feature_name):
+    import streamlit as st
     insights = treatment_feature_insights.get(feature_name, ["No treatment analysis available for this feature."])
     st.markdown(f"<h4>Analysis of Treatment vs {feature_name}</h4>",unsafe_allow_html=True)
     for point in insights:
         st.write(f"- {point}")
+
+def display_data_preview(data_path: Path, key: str, page_sizes: tuple = (25, 50, 100, 500)):
+    """Paginated, filterable view of a dataset that sends only one page to the browser."""
+    import streamlit as st
+    df = get_dataset(data_path)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        page_size = st.selectbox("Rows per page", page_sizes, key=f"{key}_page_size")
+    with col2:
+        sort_by = st.selectbox("Sort by", [None, *df.columns], key=f"{key}_sort_by")
+    with col3:
+        ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True, key=f"{key}_order") == "Ascending"
+
+    columns = st.multiselect("Columns", list(df.columns), default=list(df.columns), key=f"{key}_columns")
+    filter_columns = st.multiselect("Filter by", [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)], key=f"{key}_filter_columns")
+    filters = {
+        col: st.multiselect(f"{col} values", list(df[col].cat.categories), key=f"{key}_filter_{col}")
+        for col in filter_columns
+    }
+
+    view = filter_frame(df, filters)
+    n_rows = len(view)
+    n_pages = max(1, -(-n_rows // page_size))
+    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, key=f"{key}_page")
+    st.dataframe(preview_page(view, page, page_size, sort_by, ascending, columns))
+    start = (page - 1) * page_size
+    st.caption(f"Showing rows {min(start + 1, n_rows)}-{min(start + page_size, n_rows)} of {n_rows}")